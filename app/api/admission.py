@@ -0,0 +1,86 @@
+import asyncio
+from collections import deque
+
+from app.core import settings
+
+
+class AdmissionLimiter:
+    def __init__(self, limit: int, queue_size: int, timeout: float):
+        self.limit = max(limit, 1)
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.active = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self.admitted_total = 0
+        self.rejected_total = 0
+        self.timeouts_total = 0
+    
+    async def acquire(self) -> bool:
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            self.admitted_total += 1
+            return True
+        
+        if len(self._waiters) >= self.queue_size:
+            self.rejected_total += 1
+            return False
+        
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts_total += 1
+            return False
+        except asyncio.CancelledError:
+            # The slot may have been handed over just before the cancellation.
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if not waiter.done() or waiter.cancelled():
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+        
+        self.admitted_total += 1
+        return True
+    
+    def release(self) -> None:
+        # The slot goes straight to the oldest waiter, so a newcomer cannot
+        # overtake the queue.
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+    
+    def stats(self) -> dict[str, int]:
+        return {
+            "active": self.active,
+            "queued": len(self._waiters),
+            "admitted_total": self.admitted_total,
+            "rejected_total": self.rejected_total,
+            "timeouts_total": self.timeouts_total,
+        }
+
+
+read_limiter = AdmissionLimiter(
+    limit=settings.admission_read_limit,
+    queue_size=settings.admission_read_queue_size,
+    timeout=settings.admission_queue_timeout,
+)
+write_limiter = AdmissionLimiter(
+    limit=settings.admission_write_limit,
+    queue_size=settings.admission_write_queue_size,
+    timeout=settings.admission_queue_timeout,
+)
+
+
+def admission_stats() -> dict[str, int]:
+    return {
+        **{f"read_{key}": value for key, value in read_limiter.stats().items()},
+        **{f"write_{key}": value for key, value in write_limiter.stats().items()},
+    }
@@ -0,0 +1,54 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+
+def _timestamp(value: datetime) -> int:
+    return int(value.timestamp() * 1_000_000)
+
+
+def user_etag(user_id: int, updated_at: datetime) -> str:
+    return f'W/"{user_id}-{_timestamp(updated_at)}"'
+
+
+def page_etag(versions: list[tuple[int, datetime]]) -> str:
+    # Hashing every (id, updated_at) pair also changes the tag when a row
+    # leaves the page, which the max(updated_at) alone would miss.
+    digest = hashlib.blake2b(digest_size=12)
+    for user_id, updated_at in versions:
+        digest.update(f"{user_id}:{_timestamp(updated_at)};".encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def http_date(value: datetime) -> str:
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _strip_weak(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(
+    etag: str,
+    last_modified: datetime | None,
+    if_none_match: str | None,
+    if_modified_since: str | None,
+) -> bool:
+    # If-None-Match takes precedence over If-Modified-Since (RFC 9110, 13.1.3).
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        return _strip_weak(etag) in {_strip_weak(tag) for tag in if_none_match.split(",")}
+    
+    if if_modified_since is not None and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        # HTTP dates have a one-second resolution.
+        return last_modified.replace(microsecond=0) <= since
+    
+    return False
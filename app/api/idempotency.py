@@ -0,0 +1,12 @@
+import hashlib
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+def request_fingerprint(operation: str, body: bytes) -> str:
+    # Only a digest is stored, never the body: it may carry a password.
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(operation.encode())
+    digest.update(b"\0")
+    digest.update(body)
+    return digest.hexdigest()
@@ -1,16 +1,28 @@
+import random
 import time
 import uuid
-from typing import Any
 
-from litestar import Request, Response
 from litestar.middleware import DefineMiddleware
-from litestar.types import ASGIApp, Receive, Scope, Send
+from litestar.types import ASGIApp, Message, Receive, Scope, Send
 
-from app.infrastructure.logging import bind_trace_id, get_logger
+from app.api.admission import read_limiter, write_limiter
+from app.core import settings
+from app.infrastructure.database import observe_request, replica_router, start_query_stats
+from app.infrastructure.logging import bind_trace_id, get_logger, get_trace_id
+from app.infrastructure.metrics import http_request_duration
+from app.infrastructure.profiling import request_profiler
 
 logger = get_logger(__name__)
 
 
+def _get_header(scope: Scope, header: bytes) -> str | None:
+    # ASGI header names are already lower-cased bytes.
+    for name, value in scope["headers"]:
+        if name == header:
+            return value.decode("latin-1")
+    return None
+
+
 class TraceIDMiddleware:
     def __init__(self, app: ASGIApp):
         self.app = app
@@ -20,36 +32,53 @@ class TraceIDMiddleware:
             await self.app(scope, receive, send)
             return
         
-        request = Request(scope)
-        trace_id = request.headers.get("X-Request-Id", str(uuid.uuid4()))
+        trace_id = _get_header(scope, b"x-request-id") or str(uuid.uuid4())
+        trace_id_header = (b"x-trace-id", trace_id.encode("latin-1"))
         bind_trace_id(trace_id)
+        query_stats = start_query_stats()
         
-        start_time = time.time()
+        method = scope["method"]
+        path = scope["path"]
+        start_time = time.perf_counter_ns()
+        status_code = 500
         
-        logger.info(
-            "Request started",
-            method=request.method,
-            path=request.url.path,
-            trace_id=trace_id
+        # Errors and 5xx responses are always logged, regardless of sampling.
+        sampled = (
+            settings.log_request_sample_rate >= 1.0
+            or random.random() < settings.log_request_sample_rate
         )
         
-        async def send_wrapper(message: dict[str, Any]) -> None:
+        if sampled:
+            logger.info(
+                "Request started",
+                method=method,
+                path=path,
+                trace_id=trace_id
+            )
+        
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
             if message["type"] == "http.response.start":
-                headers = list(message.get("headers", []))
-                headers.append((b"x-trace-id", trace_id.encode()))
-                message["headers"] = headers
+                headers = message.setdefault("headers", [])
+                if isinstance(headers, list):
+                    headers.append(trace_id_header)
+                else:
+                    message["headers"] = [*headers, trace_id_header]
                 
-                duration = time.time() - start_time
-                status_code = message.get("status", 200)
+                status_code = message["status"]
                 
-                logger.info(
-                    "Request completed",
-                    method=request.method,
-                    path=request.url.path,
-                    status_code=status_code,
-                    duration=f"{duration:.3f}s",
-                    trace_id=trace_id
-                )
+                if sampled or status_code >= 500:
+                    logger.info(
+                        "Request completed",
+                        method=method,
+                        path=path,
+                        status_code=status_code,
+                        duration_ms=(time.perf_counter_ns() - start_time) / 1_000_000,
+                        db_queries=query_stats.queries,
+                        db_time_ms=round(query_stats.db_time * 1000, 3),
+                        db_wait_ms=round(query_stats.wait_time * 1000, 3),
+                        trace_id=trace_id
+                    )
             
             await send(message)
         
@@ -58,12 +87,132 @@ class TraceIDMiddleware:
         except Exception as e:
             logger.error(
                 "Request failed",
-                method=request.method,
-                path=request.url.path,
+                method=method,
+                path=path,
                 error=str(e),
                 trace_id=trace_id
             )
             raise
+        finally:
+            # Routing has already run, so the template keeps label cardinality
+            # bounded (/users/{user_id:int} rather than every id).
+            route = scope.get("path_template", path)
+            http_request_duration.observe(
+                (time.perf_counter_ns() - start_time) / 1_000_000_000,
+                method,
+                route,
+                status_code,
+            )
+            observe_request(query_stats, route, method)
+
+
+PROFILE_HEADER = b"x-profile"
+# The admin endpoints take the same header as their credential.
+ADMIN_PREFIX = "/admin"
+
+
+class ProfilingMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["path"].startswith(ADMIN_PREFIX)
+            or not request_profiler.wants(_get_header(scope, PROFILE_HEADER))
+        ):
+            await self.app(scope, receive, send)
+            return
+        
+        name = request_profiler.file_name(get_trace_id() or str(uuid.uuid4()))
+        profile_header = (b"x-profile-id", name.encode("latin-1"))
+        
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), profile_header]
+            await send(message)
+        
+        await request_profiler.run(name, lambda: self.app(scope, receive, send_wrapper))
+
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+# Probes and metrics must keep answering while the service sheds load.
+EXEMPT_PREFIXES = ("/health", "/metrics")
+
+_overloaded_body = b'{"status_code":503,"detail":"Service is overloaded, retry later"}'
+
+
+class AdmissionControlMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not settings.admission_enabled
+            or scope["path"].startswith(EXEMPT_PREFIXES)
+        ):
+            await self.app(scope, receive, send)
+            return
+        
+        limiter = read_limiter if scope["method"] in READ_METHODS else write_limiter
+        if not await limiter.acquire():
+            await self._reject(send)
+            return
+        
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+    
+    async def _reject(self, send: Send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(_overloaded_body)).encode()),
+                    (b"retry-after", str(settings.admission_retry_after).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": _overloaded_body})
+
+
+PRIMARY_COOKIE = "db_primary"
+READ_CONSISTENCY_HEADER = "x-read-consistency"
+
+
+class ReadYourWritesMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] in READ_METHODS
+            or not replica_router.enabled
+        ):
+            await self.app(scope, receive, send)
+            return
+        
+        # A successful write pins the client's reads to the primary until the
+        # replicas have had time to catch up.
+        cookie = (
+            f"{PRIMARY_COOKIE}=1; Max-Age={settings.read_your_writes_window}; "
+            "Path=/; HttpOnly; SameSite=Lax"
+        ).encode("latin-1")
+        
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                message["headers"] = [*message.get("headers", []), (b"set-cookie", cookie)]
+            await send(message)
+        
+        await self.app(scope, receive, send_wrapper)
 
 
 trace_id_middleware = DefineMiddleware(TraceIDMiddleware)
+profiling_middleware = DefineMiddleware(ProfilingMiddleware)
+admission_middleware = DefineMiddleware(AdmissionControlMiddleware)
+read_your_writes_middleware = DefineMiddleware(ReadYourWritesMiddleware)
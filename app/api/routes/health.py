@@ -0,0 +1,55 @@
+import asyncio
+
+from litestar import Controller, Response, get
+from litestar.status_codes import HTTP_200_OK, HTTP_503_SERVICE_UNAVAILABLE
+
+from app.infrastructure.database import engine, ping, replica_router
+from app.infrastructure.messaging import event_consumer, event_producer
+from app.infrastructure.startup import startup_tracker
+
+READINESS_DB_TIMEOUT = 1.0
+
+
+async def _database_ready() -> bool:
+    try:
+        await asyncio.wait_for(ping(engine), timeout=READINESS_DB_TIMEOUT)
+    except Exception:
+        return False
+    return True
+
+
+class HealthController(Controller):
+    path = "/health"
+    tags = ["health"]
+    include_in_schema = False
+    
+    @get(
+        "/live",
+        summary="Liveness probe",
+    )
+    async def live(self) -> dict[str, str]:
+        return {"status": "ok"}
+    
+    @get(
+        "/ready",
+        summary="Readiness probe",
+    )
+    async def ready(self) -> Response[dict]:
+        dependencies = {
+            "database": await _database_ready(),
+            "event_producer": event_producer.is_connected,
+            "event_consumer": event_consumer.is_connected,
+        }
+        # Events go through the outbox, so requests can be served while the
+        # broker is still reconnecting: only the database gates readiness.
+        ready = dependencies["database"]
+        return Response(
+            {
+                "ready": ready,
+                "dependencies": dependencies,
+                "read_replicas": replica_router.stats(),
+                "errors": startup_tracker.errors,
+                "startup_ms": startup_tracker.timings_ms,
+            },
+            status_code=HTTP_200_OK if ready else HTTP_503_SERVICE_UNAVAILABLE,
+        )
@@ -0,0 +1,17 @@
+from litestar import Controller, get
+
+from app.infrastructure.metrics import metrics_registry
+
+
+class MetricsController(Controller):
+    path = "/metrics"
+    tags = ["metrics"]
+    include_in_schema = False
+    
+    @get(
+        "/",
+        media_type="text/plain; version=0.0.4",
+        summary="Prometheus metrics",
+    )
+    async def metrics(self) -> str:
+        return metrics_registry.render()
@@ -0,0 +1,52 @@
+from datetime import datetime
+from typing import Annotated
+
+import msgspec
+from litestar import Controller, get
+from litestar.exceptions import NotFoundException, PermissionDeniedException
+from litestar.params import Parameter
+from litestar.response import File
+
+from app.infrastructure.profiling import request_profiler
+
+ProfileToken = Annotated[str | None, Parameter(header="X-Profile", required=False)]
+
+
+class ProfileInfo(msgspec.Struct):
+    name: str
+    trace_id: str
+    size: int
+    created_at: datetime
+
+
+def _authorize(token: str | None) -> None:
+    # A disabled profiler hides the endpoints altogether.
+    if not request_profiler.enabled:
+        raise NotFoundException()
+    if not request_profiler.authorized(token):
+        raise PermissionDeniedException(detail="Invalid profiling token")
+
+
+class ProfileController(Controller):
+    path = "/admin/profiles"
+    tags = ["admin"]
+    include_in_schema = False
+    
+    @get(
+        "/",
+        summary="List recent request profiles",
+    )
+    async def list_profiles(self, token: ProfileToken = None) -> list[ProfileInfo]:
+        _authorize(token)
+        return [ProfileInfo(**profile) for profile in request_profiler.list_profiles()]
+    
+    @get(
+        "/{name:str}",
+        summary="Download a request profile",
+    )
+    async def download_profile(self, name: str, token: ProfileToken = None) -> File:
+        _authorize(token)
+        path = request_profiler.path_for(name)
+        if path is None:
+            raise NotFoundException(detail="Profile not found")
+        return File(path=path, filename=name, media_type="application/octet-stream")
@@ -1,55 +1,232 @@
+from collections.abc import AsyncGenerator, AsyncIterator
+from datetime import datetime, timezone
 from typing import Annotated
 
-from litestar import Controller, delete, get, post, put
+import msgspec
+from litestar import Controller, MediaType, Request, Response, delete, get, patch, post, put
+from litestar.datastructures import ResponseHeader
 from litestar.di import Provide
-from litestar.exceptions import NotFoundException
+from litestar.exceptions import HTTPException, NotFoundException, ValidationException
 from litestar.params import Parameter
-from litestar.status_codes import HTTP_201_CREATED, HTTP_204_NO_CONTENT, HTTP_404_NOT_FOUND
+from litestar.response import Stream
+from litestar.status_codes import (
+    HTTP_200_OK,
+    HTTP_201_CREATED,
+    HTTP_204_NO_CONTENT,
+    HTTP_304_NOT_MODIFIED,
+    HTTP_409_CONFLICT,
+    HTTP_410_GONE,
+    HTTP_422_UNPROCESSABLE_ENTITY,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.domain.services import UserService
-from app.schemas import UserCreate, UserResponse, UserUpdate
+from app.api.conditional import http_date, is_not_modified, page_etag, user_etag
+from app.api.idempotency import REPLAYED_HEADER, request_fingerprint
+from app.api.middleware import PRIMARY_COOKIE, READ_CONSISTENCY_HEADER
+from app.core import settings
+from app.domain.services import ChangeCursorExpired, IdempotencyKeyConflict, UserService
+from app.infrastructure.database import replica_router
+from app.schemas import (
+    ChangeCursor,
+    UserChange,
+    UserCreate,
+    UserCursor,
+    UserPatch,
+    UserResponse,
+    UserUpdate,
+    decode_change_cursor,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+_ndjson_encoder = msgspec.json.Encoder()
+
+IfNoneMatch = Annotated[str | None, Parameter(header="If-None-Match", required=False)]
+IfModifiedSince = Annotated[str | None, Parameter(header="If-Modified-Since", required=False)]
+IdempotencyKey = Annotated[
+    str | None,
+    Parameter(header="Idempotency-Key", required=False, min_length=1, max_length=255),
+]
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MAX_ID = 2**63 - 1
+
+
+def _parse_since(since: str | None) -> tuple[datetime, int]:
+    if since is None:
+        return _EPOCH, 0
+    try:
+        timestamp = datetime.fromisoformat(since)
+    except ValueError:
+        try:
+            cursor = decode_change_cursor(since)
+        except ValueError:
+            raise ValidationException(detail="since must be an ISO 8601 timestamp or a cursor")
+        return cursor.changed_at, cursor.id
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    # A plain timestamp means everything changed strictly after it.
+    return timestamp, _MAX_ID
+
+
+def _check_batch(size: int) -> None:
+    if not size:
+        raise ValidationException(detail="Batch must not be empty")
+    if size > settings.batch_max_size:
+        raise ValidationException(
+            detail=f"Batch size exceeds the limit of {settings.batch_max_size}"
+        )
+
+
+def _check_unique(user_ids: list[int]) -> None:
+    if len(set(user_ids)) != len(user_ids):
+        raise ValidationException(detail="Batch must not contain duplicate ids")
+
+
+def _page_validators(versions: list[tuple]) -> dict[str, str]:
+    headers = {"ETag": page_etag(versions)}
+    if versions:
+        headers["Last-Modified"] = http_date(max(updated_at for _, updated_at in versions))
+    return headers
+
+
+async def _replay(
+    user_service: UserService,
+    idempotency_key: str,
+    operation: str,
+    data: msgspec.Struct,
+) -> Response | None:
+    fingerprint = request_fingerprint(operation, msgspec.json.encode(data))
+    record = await user_service.claim_idempotency_key(idempotency_key, fingerprint)
+    if record is None:
+        return None
+    if record.fingerprint != fingerprint:
+        raise HTTPException(
+            status_code=HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key was already used for a different request",
+        )
+    return Response(record.response, media_type=MediaType.JSON, headers={REPLAYED_HEADER: "true"})
+
+
+def _idempotency_conflict(request: Request, exc: IdempotencyKeyConflict) -> Response:
+    return Response(
+        {"status_code": HTTP_409_CONFLICT, "detail": "Idempotency-Key is in use, retry the request"},
+        status_code=HTTP_409_CONFLICT,
+    )
+
+
+def _change_cursor_expired(request: Request, exc: ChangeCursorExpired) -> Response:
+    return Response(
+        {
+            "status_code": HTTP_410_GONE,
+            "detail": "since is older than the tombstone retention, resync from the start",
+        },
+        status_code=HTTP_410_GONE,
+    )
 
 
 async def provide_user_service(db_session: AsyncSession) -> UserService:
     return UserService(db_session)
 
 
+async def provide_read_user_service(
+    request: Request,
+    db_session: AsyncSession,
+) -> AsyncGenerator[UserService, None]:
+    reads_own_writes = (
+        PRIMARY_COOKIE in request.cookies
+        or request.headers.get(READ_CONSISTENCY_HEADER) == "primary"
+    )
+    if replica_router.enabled and not reads_own_writes:
+        session = await replica_router.open_session()
+        if session is not None:
+            try:
+                yield UserService(session)
+            finally:
+                await session.close()
+            return
+    
+    yield UserService(db_session, consistent_reads=replica_router.enabled and reads_own_writes)
+
+
+async def _export_users_ndjson(fetch_size: int) -> AsyncIterator[bytes]:
+    # The request-scoped session is closed once the response starts, so the
+    # export keeps its own session open for the whole stream.
+    buffer = bytearray()
+    async with replica_router.session() as session:
+        user_service = UserService(session)
+        async for rows in user_service.export_users(fetch_size=fetch_size):
+            for row in rows:
+                _ndjson_encoder.encode_into(UserResponse(*row), buffer, -1)
+                buffer.extend(b"\n")
+            yield bytes(buffer)
+            buffer.clear()
+
+
 class UserController(Controller):
     path = "/users"
     tags = ["users"]
-    dependencies = {"user_service": Provide(provide_user_service)}
+    # Safe read-only handlers take read_user_service and may be served by a
+    # replica; writes and the change feed, whose cursor must not run ahead
+    # of a lagging replica, stay on the primary.
+    dependencies = {
+        "user_service": Provide(provide_user_service),
+        "read_user_service": Provide(provide_read_user_service),
+    }
+    exception_handlers = {
+        IdempotencyKeyConflict: _idempotency_conflict,
+        ChangeCursorExpired: _change_cursor_expired,
+    }
     
     @post(
         "/",
         status_code=HTTP_201_CREATED,
         summary="Create a new user",
+        response_headers=[
+            ResponseHeader(
+                name=REPLAYED_HEADER,
+                description="Set when the response is replayed for a repeated Idempotency-Key",
+                documentation_only=True,
+            ),
+        ],
     )
     async def create_user(
         self,
         user_service: UserService,
         data: UserCreate,
-    ) -> UserResponse:
-        user = await user_service.create_user(data)
-        return UserResponse(
-            id=user.id,
-            name=user.name,
-            surname=user.surname,
-            created_at=user.created_at,
-            updated_at=user.updated_at,
+        idempotency_key: IdempotencyKey = None,
+    ) -> Response[UserResponse]:
+        if idempotency_key is not None:
+            replay = await _replay(user_service, idempotency_key, "create_user", data)
+            if replay is not None:
+                return replay
+        
+        user = await user_service.create_user(data, idempotency_key=idempotency_key)
+        return Response(
+            UserResponse(
+                id=user.id,
+                name=user.name,
+                surname=user.surname,
+                created_at=user.created_at,
+                updated_at=user.updated_at,
+            )
         )
     
-    @get(
-        "/",
-        summary="Get list of users",
+    @post(
+        "/batch",
+        status_code=HTTP_201_CREATED,
+        summary="Create users in a single batch",
     )
-    async def list_users(
+    async def create_users(
         self,
         user_service: UserService,
-        limit: Annotated[int, Parameter(ge=1, le=100)] = 100,
-        offset: Annotated[int, Parameter(ge=0)] = 0,
+        data: list[UserCreate],
     ) -> list[UserResponse]:
-        users = await user_service.list_users(limit=limit, offset=offset)
+        _check_batch(len(data))
+        
+        users = await user_service.create_users(data)
         return [
             UserResponse(
                 id=user.id,
@@ -61,47 +238,232 @@ class UserController(Controller):
             for user in users
         ]
     
+    @patch(
+        "/batch",
+        summary="Update users in a single batch",
+    )
+    async def update_users(
+        self,
+        user_service: UserService,
+        data: list[UserPatch],
+    ) -> list[UserResponse]:
+        _check_batch(len(data))
+        _check_unique([item.id for item in data])
+        
+        users = await user_service.update_users(data)
+        return [
+            UserResponse(
+                id=user.id,
+                name=user.name,
+                surname=user.surname,
+                created_at=user.created_at,
+                updated_at=user.updated_at,
+            )
+            for user in users
+        ]
+    
+    @delete(
+        "/batch",
+        status_code=HTTP_200_OK,
+        summary="Delete users in a single batch",
+    )
+    async def delete_users(
+        self,
+        user_service: UserService,
+        data: list[int],
+    ) -> list[int]:
+        _check_batch(len(data))
+        _check_unique(data)
+        
+        return await user_service.delete_users(data)
+    
+    @get(
+        "/",
+        summary="Get list of users",
+        response_headers=[
+            ResponseHeader(
+                name="X-Next-Cursor",
+                description="Opaque cursor of the next page, absent on the last page",
+                documentation_only=True,
+            ),
+            ResponseHeader(name="ETag", documentation_only=True),
+            ResponseHeader(name="Last-Modified", documentation_only=True),
+        ],
+    )
+    async def list_users(
+        self,
+        read_user_service: UserService,
+        limit: Annotated[int, Parameter(ge=1, le=100)] = 100,
+        offset: Annotated[int, Parameter(ge=0)] = 0,
+        cursor: Annotated[str | None, Parameter(min_length=1)] = None,
+        ids: Annotated[
+            str | None,
+            Parameter(description="Comma-separated user ids to fetch in one request", min_length=1),
+        ] = None,
+        if_none_match: IfNoneMatch = None,
+    ) -> Response[list[UserResponse]]:
+        if ids is not None:
+            try:
+                user_ids = [int(user_id) for user_id in ids.split(",")]
+            except ValueError:
+                raise ValidationException(detail="ids must be a comma-separated list of integers")
+            if len(user_ids) > 100:
+                raise ValidationException(detail="At most 100 ids can be requested at once")
+            users = await read_user_service.get_users(user_ids)
+            headers = _page_validators([(user.id, user.updated_at) for user in users])
+            if is_not_modified(headers["ETag"], None, if_none_match, None):
+                return Response(None, status_code=HTTP_304_NOT_MODIFIED, headers=headers)
+            return Response(users, headers=headers)
+        
+        after = None
+        if cursor is not None:
+            if offset:
+                raise ValidationException(detail="cursor and offset are mutually exclusive")
+            try:
+                after = decode_cursor(cursor)
+            except ValueError:
+                raise ValidationException(detail="Invalid cursor")
+        
+        page = {
+            "limit": limit,
+            "offset": offset,
+            "after": (after.created_at, after.id) if after else None,
+        }
+        
+        # Only If-None-Match is honoured for lists: a deletion changes the page
+        # without moving its newest updated_at, so a date is not a validator.
+        if if_none_match is not None:
+            versions = await read_user_service.list_user_versions(**page)
+            headers = _page_validators([(row.id, row.updated_at) for row in versions])
+            if len(versions) == limit:
+                last = versions[-1]
+                headers["X-Next-Cursor"] = encode_cursor(UserCursor(created_at=last.created_at, id=last.id))
+            if is_not_modified(headers["ETag"], None, if_none_match, None):
+                return Response(None, status_code=HTTP_304_NOT_MODIFIED, headers=headers)
+        
+        users = await read_user_service.list_users(**page)
+        
+        headers = _page_validators([(user.id, user.updated_at) for user in users])
+        if len(users) == limit:
+            last = users[-1]
+            headers["X-Next-Cursor"] = encode_cursor(UserCursor(created_at=last.created_at, id=last.id))
+        
+        return Response(
+            users,
+            headers=headers,
+        )
+    
+    @get(
+        "/changes",
+        summary="Get users created, updated or deleted after a watermark",
+        response_headers=[
+            ResponseHeader(
+                name="X-Next-Cursor",
+                description="Watermark to pass as since on the next call",
+                documentation_only=True,
+            ),
+        ],
+    )
+    async def list_changes(
+        self,
+        user_service: UserService,
+        since: Annotated[
+            str | None,
+            Parameter(description="ISO 8601 timestamp or X-Next-Cursor of the previous call", min_length=1),
+        ] = None,
+        limit: Annotated[int, Parameter(ge=1, le=1000)] = 100,
+    ) -> Response[list[UserChange]]:
+        after = _parse_since(since)
+        changes, until = await user_service.list_changes(after=after, limit=limit)
+        
+        # Always returned, so an empty page still hands back a resumable
+        # watermark. A short page has read everything settled up to until, so
+        # the cursor moves there and an idle feed never falls behind the purge.
+        if len(changes) == limit:
+            last = ChangeCursor(changed_at=changes[-1].changed_at, id=changes[-1].id)
+        else:
+            last = ChangeCursor(*max(after, (until, _MAX_ID)))
+        return Response(changes, headers={"X-Next-Cursor": encode_cursor(last)})
+    
+    @get(
+        "/export",
+        summary="Export all users as NDJSON",
+        media_type="application/x-ndjson",
+    )
+    async def export_users(
+        self,
+        fetch_size: Annotated[int, Parameter(ge=1, le=10_000)] = settings.export_fetch_size,
+    ) -> Stream:
+        return Stream(_export_users_ndjson(fetch_size), media_type="application/x-ndjson")
+    
     @get(
         "/{user_id:int}",
         summary="Get user by ID",
+        response_headers=[
+            ResponseHeader(name="ETag", documentation_only=True),
+            ResponseHeader(name="Last-Modified", documentation_only=True),
+        ],
     )
     async def get_user(
         self,
-        user_service: UserService,
+        read_user_service: UserService,
         user_id: int,
-    ) -> UserResponse:
-        user = await user_service.get_user(user_id)
+        if_none_match: IfNoneMatch = None,
+        if_modified_since: IfModifiedSince = None,
+    ) -> Response[UserResponse]:
+        if if_none_match is not None or if_modified_since is not None:
+            # Revalidation only needs updated_at, not the whole row.
+            updated_at = await read_user_service.get_user_version(user_id)
+            if updated_at is None:
+                raise NotFoundException(detail="User not found")
+            headers = {"ETag": user_etag(user_id, updated_at), "Last-Modified": http_date(updated_at)}
+            if is_not_modified(headers["ETag"], updated_at, if_none_match, if_modified_since):
+                return Response(None, status_code=HTTP_304_NOT_MODIFIED, headers=headers)
+        
+        user = await read_user_service.get_user(user_id)
         if not user:
-            raise HTTP_404_NOT_FOUND
+            raise NotFoundException(detail="User not found")
         
-        return UserResponse(
-            id=user.id,
-            name=user.name,
-            surname=user.surname,
-            created_at=user.created_at,
-            updated_at=user.updated_at,
+        return Response(
+            user,
+            headers={"ETag": user_etag(user.id, user.updated_at), "Last-Modified": http_date(user.updated_at)},
         )
     
     @put(
         "/{user_id:int}",
         summary="Update user",
+        response_headers=[
+            ResponseHeader(
+                name=REPLAYED_HEADER,
+                description="Set when the response is replayed for a repeated Idempotency-Key",
+                documentation_only=True,
+            ),
+        ],
     )
     async def update_user(
         self,
         user_service: UserService,
         user_id: int,
         data: UserUpdate,
-    ) -> UserResponse:
-        user = await user_service.update_user(user_id, data)
+        idempotency_key: IdempotencyKey = None,
+    ) -> Response[UserResponse]:
+        if idempotency_key is not None:
+            replay = await _replay(user_service, idempotency_key, f"update_user:{user_id}", data)
+            if replay is not None:
+                return replay
+        
+        user = await user_service.update_user(user_id, data, idempotency_key=idempotency_key)
         if not user:
             raise NotFoundException(detail="User not found")
-
-        return UserResponse(
-            id=user.id,
-            name=user.name,
-            surname=user.surname,
-            created_at=user.created_at,
-            updated_at=user.updated_at,
+        
+        return Response(
+            UserResponse(
+                id=user.id,
+                name=user.name,
+                surname=user.surname,
+                created_at=user.created_at,
+                updated_at=user.updated_at,
+            )
         )
     
     @delete(
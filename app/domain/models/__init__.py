@@ -1,3 +1,6 @@
+from .idempotency import IdempotencyKey
+from .outbox import OutboxEvent
+from .tombstone import UserTombstone, UserTombstonePurge
 from .user import User
 
-__all__ = ["User"]
+__all__ = ["User", "OutboxEvent", "UserTombstone", "UserTombstonePurge", "IdempotencyKey"]
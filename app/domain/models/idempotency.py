@@ -0,0 +1,25 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from advanced_alchemy.base import BigIntBase
+from advanced_alchemy.types import DateTimeUTC
+from sqlalchemy import Index, LargeBinary, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class IdempotencyKey(BigIntBase):
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        Index("ix_idempotency_keys_created_at", "created_at"),
+    )
+    
+    key: Mapped[str] = mapped_column(Text, nullable=False, unique=True)
+    fingerprint: Mapped[str] = mapped_column(Text, nullable=False)
+    # Written in the same transaction as the change, so it is only NULL
+    # while the claiming request is still running.
+    response: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTimeUTC(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
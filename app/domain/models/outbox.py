@@ -0,0 +1,21 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from advanced_alchemy.base import BigIntBase
+from advanced_alchemy.types import DateTimeUTC, JsonB
+from sqlalchemy import BigInteger, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class OutboxEvent(BigIntBase):
+    __tablename__ = "outbox_events"
+    
+    event_type: Mapped[str] = mapped_column(Text, nullable=False)
+    user_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    trace_id: Mapped[str] = mapped_column(Text, nullable=False)
+    data: Mapped[Optional[dict]] = mapped_column(JsonB, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTimeUTC(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
@@ -0,0 +1,26 @@
+from datetime import datetime, timezone
+
+from advanced_alchemy.base import BigIntBase
+from advanced_alchemy.types import DateTimeUTC
+from sqlalchemy import BigInteger, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class UserTombstone(BigIntBase):
+    __tablename__ = "user_tombstones"
+    __table_args__ = (
+        Index("ix_user_tombstones_deleted_at_user_id", "deleted_at", "user_id"),
+    )
+    
+    user_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(
+        DateTimeUTC(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+
+
+class UserTombstonePurge(BigIntBase):
+    __tablename__ = "user_tombstone_purges"
+    
+    purged_before: Mapped[datetime] = mapped_column(DateTimeUTC(timezone=True), nullable=False)
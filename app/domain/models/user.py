@@ -2,12 +2,16 @@ from datetime import datetime, timezone
 from typing import Optional
 
 from advanced_alchemy.base import BigIntAuditBase
-from sqlalchemy import String, Text
+from sqlalchemy import Index, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 
 class User(BigIntAuditBase):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_created_at_id", "created_at", "id"),
+        Index("ix_users_updated_at_id", "updated_at", "id"),
+    )
     
     name: Mapped[str] = mapped_column(Text, nullable=False)
     surname: Mapped[str] = mapped_column(Text, nullable=False)
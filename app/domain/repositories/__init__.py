@@ -1,3 +1,12 @@
+from .asyncpg_user_repository import AsyncpgUserRepository
+from .idempotency_repository import AsyncIdempotencyRepository
+from .outbox_repository import AsyncOutboxRepository
 from .user_repository import AsyncUserRepository, UserRepository
 
-__all__ = ["UserRepository", "AsyncUserRepository"]
+__all__ = [
+    "UserRepository",
+    "AsyncUserRepository",
+    "AsyncpgUserRepository",
+    "AsyncOutboxRepository",
+    "AsyncIdempotencyRepository",
+]
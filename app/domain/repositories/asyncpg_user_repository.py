@@ -0,0 +1,60 @@
+import time
+from datetime import datetime
+from typing import Any, Optional
+
+import asyncpg
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.database import record_query
+from app.schemas import UserResponse
+
+_COLUMNS = "id, name, surname, created_at, updated_at"
+
+GET_BY_ID = f"SELECT {_COLUMNS} FROM users WHERE id = $1"
+GET_MANY = f"SELECT {_COLUMNS} FROM users WHERE id = ANY($1::bigint[])"
+GET_PAGE = f"SELECT {_COLUMNS} FROM users ORDER BY created_at, id LIMIT $1 OFFSET $2"
+GET_PAGE_AFTER = (
+    f"SELECT {_COLUMNS} FROM users WHERE (created_at, id) > ($1, $2) "
+    "ORDER BY created_at, id LIMIT $3"
+)
+
+
+# Read-only queries executed directly on the asyncpg connection behind the
+# session: no ORM hydration, only the response columns, and asyncpg keeps
+# each statement prepared per connection. They bypass the engine events, so
+# each call is timed here into the same query stats and slow-query log.
+class AsyncpgUserRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+    
+    async def _driver_connection(self) -> asyncpg.Connection:
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        return raw_connection.driver_connection
+    
+    async def _fetch(self, query: str, *args: Any) -> list[asyncpg.Record]:
+        driver = await self._driver_connection()
+        started = time.perf_counter()
+        rows = await driver.fetch(query, *args)
+        record_query(time.perf_counter() - started, query)
+        return rows
+    
+    async def get_by_id(self, user_id: int) -> Optional[UserResponse]:
+        rows = await self._fetch(GET_BY_ID, user_id)
+        return UserResponse(*rows[0]) if rows else None
+    
+    async def get_many(self, user_ids: list[int]) -> list[UserResponse]:
+        rows = await self._fetch(GET_MANY, user_ids)
+        return [UserResponse(*row) for row in rows]
+    
+    async def get_all(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        after: tuple[datetime, int] | None = None,
+    ) -> list[UserResponse]:
+        if after is not None:
+            rows = await self._fetch(GET_PAGE_AFTER, after[0], after[1], limit)
+        else:
+            rows = await self._fetch(GET_PAGE, limit, offset)
+        return [UserResponse(*row) for row in rows]
@@ -0,0 +1,55 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import Row, delete, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.models import IdempotencyKey
+
+
+class AsyncIdempotencyRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+    
+    async def get(self, key: str, cutoff: datetime) -> Optional[Row]:
+        result = await self.session.execute(
+            select(IdempotencyKey.fingerprint, IdempotencyKey.response).where(
+                IdempotencyKey.key == key,
+                IdempotencyKey.created_at >= cutoff,
+            )
+        )
+        return result.first()
+    
+    async def claim(self, key: str, fingerprint: str, cutoff: datetime) -> bool:
+        # An expired record no longer guards the key.
+        await self.session.execute(
+            delete(IdempotencyKey).where(
+                IdempotencyKey.key == key,
+                IdempotencyKey.created_at < cutoff,
+            )
+        )
+        # While another transaction holds the same key uncommitted, the insert
+        # waits for it and then does nothing: duplicates queue behind the
+        # first request instead of racing it.
+        dialect = postgresql if self.session.bind.dialect.name == "postgresql" else sqlite
+        result = await self.session.execute(
+            dialect.insert(IdempotencyKey)
+            .values(key=key, fingerprint=fingerprint, created_at=datetime.now(timezone.utc))
+            .on_conflict_do_nothing(index_elements=[IdempotencyKey.key])
+            .returning(IdempotencyKey.id)
+        )
+        return result.scalar_one_or_none() is not None
+    
+    async def complete(self, key: str, response: bytes) -> bool:
+        result = await self.session.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.key == key, IdempotencyKey.response.is_(None))
+            .values(response=response)
+        )
+        return result.rowcount > 0
+    
+    async def purge(self, cutoff: datetime) -> None:
+        await self.session.execute(
+            delete(IdempotencyKey).where(IdempotencyKey.created_at < cutoff)
+        )
@@ -0,0 +1,29 @@
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.models import OutboxEvent
+
+
+class AsyncOutboxRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+    
+    async def add_many(self, values: list[dict]) -> None:
+        if values:
+            await self.session.execute(insert(OutboxEvent), values)
+    
+    async def claim_batch(self, limit: int) -> list[OutboxEvent]:
+        # SKIP LOCKED lets relays of several workers drain the outbox
+        # concurrently without publishing the same row twice.
+        result = await self.session.scalars(
+            select(OutboxEvent)
+            .order_by(OutboxEvent.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return list(result.all())
+    
+    async def delete_many(self, event_ids: list[int]) -> None:
+        await self.session.execute(
+            delete(OutboxEvent).where(OutboxEvent.id.in_(event_ids))
+        )
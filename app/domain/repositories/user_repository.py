@@ -1,10 +1,31 @@
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
 from typing import Optional
 
 from advanced_alchemy.repository import SQLAlchemySyncRepository
-from sqlalchemy import select
+from sqlalchemy import (
+    BigInteger,
+    Row,
+    Text,
+    any_,
+    bindparam,
+    column,
+    delete,
+    false,
+    func,
+    insert,
+    null,
+    select,
+    true,
+    tuple_,
+    union_all,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.domain.models import User
+from app.domain.models import User, UserTombstone, UserTombstonePurge
 
 
 class UserRepository(SQLAlchemySyncRepository[User]):
@@ -15,11 +36,18 @@ class AsyncUserRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
     
-    async def create(self, user: User) -> User:
-        self.session.add(user)
-        await self.session.flush()
-        await self.session.refresh(user)
-        return user
+    async def create(self, values: dict) -> User:
+        result = await self.session.scalars(
+            insert(User).values(**values).returning(User)
+        )
+        return result.one()
+    
+    async def create_many(self, values: list[dict]) -> list[User]:
+        result = await self.session.scalars(
+            insert(User).returning(User, sort_by_parameter_order=True),
+            values,
+        )
+        return list(result.all())
     
     async def get_by_id(self, user_id: int) -> Optional[User]:
         result = await self.session.execute(
@@ -27,17 +55,188 @@ class AsyncUserRepository:
         )
         return result.scalar_one_or_none()
     
-    async def get_all(self, limit: int = 100, offset: int = 0) -> list[User]:
-        result = await self.session.execute(
-            select(User).limit(limit).offset(offset)
+    async def get_updated_at(self, user_id: int) -> Optional[datetime]:
+        return await self.session.scalar(
+            select(User.updated_at).where(User.id == user_id)
         )
+    
+    def _id_in(self, user_ids: list[int]):
+        if self.session.bind.dialect.name == "postgresql":
+            # One array parameter keeps a single prepared statement for any
+            # number of ids, unlike an expanding IN list.
+            return User.id == any_(bindparam("user_ids", user_ids, type_=ARRAY(BigInteger)))
+        return User.id.in_(user_ids)
+    
+    async def get_many(self, user_ids: list[int]) -> list[User]:
+        result = await self.session.execute(select(User).where(self._id_in(user_ids)))
+        return list(result.scalars().all())
+    
+    def _page(
+        self,
+        statement,
+        limit: int,
+        offset: int,
+        after: tuple[datetime, int] | None,
+    ):
+        statement = statement.order_by(User.created_at, User.id).limit(limit)
+        if after is not None:
+            return statement.where(tuple_(User.created_at, User.id) > after)
+        return statement.offset(offset)
+    
+    async def get_all(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        after: tuple[datetime, int] | None = None,
+    ) -> list[User]:
+        result = await self.session.execute(self._page(select(User), limit, offset, after))
         return list(result.scalars().all())
     
-    async def update(self, user: User) -> User:
-        await self.session.flush()
-        await self.session.refresh(user)
-        return user
+    async def get_versions(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        after: tuple[datetime, int] | None = None,
+    ) -> list[Row]:
+        result = await self.session.execute(
+            self._page(select(User.id, User.created_at, User.updated_at), limit, offset, after)
+        )
+        return list(result.all())
+    
+    async def stream_all(self, fetch_size: int = 1000) -> AsyncIterator[Sequence[Row]]:
+        result = await self.session.stream(
+            select(User.id, User.name, User.surname, User.created_at, User.updated_at)
+            .order_by(User.id)
+            .execution_options(yield_per=fetch_size)
+        )
+        async for rows in result.partitions():
+            yield rows
+    
+    async def update(self, user_id: int, values: dict) -> Optional[User]:
+        result = await self.session.scalars(
+            update(User)
+            .where(User.id == user_id)
+            .values(**values)
+            .returning(User)
+            .execution_options(synchronize_session=False)
+        )
+        return result.one_or_none()
     
-    async def delete(self, user: User) -> None:
-        await self.session.delete(user)
-        await self.session.flush()
+    async def update_many(self, patches: list[dict]) -> list[User]:
+        if self.session.bind.dialect.name != "postgresql":
+            users = [
+                await self.update(
+                    patch["id"],
+                    {field: value for field, value in patch.items() if field != "id" and value is not None},
+                )
+                for patch in patches
+            ]
+            return [user for user in users if user is not None]
+        
+        # UPDATE ... FROM (VALUES ...): every row in one statement, and a
+        # missing field keeps the current value through COALESCE.
+        rows = values(
+            column("id", BigInteger),
+            column("name", Text),
+            column("surname", Text),
+            column("password", Text),
+            name="patches",
+        ).data([(patch["id"], patch["name"], patch["surname"], patch["password"]) for patch in patches])
+        result = await self.session.scalars(
+            update(User)
+            .where(User.id == rows.c.id)
+            .values(
+                name=func.coalesce(rows.c.name, User.name),
+                surname=func.coalesce(rows.c.surname, User.surname),
+                password=func.coalesce(rows.c.password, User.password),
+            )
+            .returning(User)
+            .execution_options(synchronize_session=False)
+        )
+        return list(result.all())
+    
+    async def delete(self, user_id: int) -> bool:
+        result = await self.session.scalars(
+            delete(User)
+            .where(User.id == user_id)
+            .returning(User.id)
+            .execution_options(synchronize_session=False)
+        )
+        return result.one_or_none() is not None
+    
+    async def delete_many(self, user_ids: list[int]) -> list[int]:
+        result = await self.session.scalars(
+            delete(User)
+            .where(self._id_in(user_ids))
+            .returning(User.id)
+            .execution_options(synchronize_session=False)
+        )
+        return list(result.all())
+    
+    async def add_tombstones(self, user_ids: list[int]) -> None:
+        await self.session.execute(
+            insert(UserTombstone),
+            [{"user_id": user_id} for user_id in user_ids],
+        )
+    
+    async def purge_tombstones(self, cutoff: datetime) -> None:
+        await self.session.execute(
+            delete(UserTombstone).where(UserTombstone.deleted_at < cutoff)
+        )
+        # The cutoff is kept with the purge, so every worker can tell which
+        # cursors may have missed a deletion.
+        await self.session.execute(
+            delete(UserTombstonePurge).where(UserTombstonePurge.purged_before < cutoff)
+        )
+        await self.session.execute(insert(UserTombstonePurge).values(purged_before=cutoff))
+    
+    async def get_tombstones_purged_before(self) -> Optional[datetime]:
+        return await self.session.scalar(select(func.max(UserTombstonePurge.purged_before)))
+    
+    async def get_changes(
+        self,
+        after: tuple[datetime, int],
+        until: datetime,
+        limit: int = 100,
+    ) -> list[Row]:
+        # Each side walks its own (timestamp, id) index and stops at the limit;
+        # only the two short runs are merged.
+        upserts = (
+            select(
+                User.id,
+                User.updated_at.label("changed_at"),
+                false().label("deleted"),
+                User.name,
+                User.surname,
+                User.created_at,
+            )
+            .where(tuple_(User.updated_at, User.id) > after, User.updated_at <= until)
+            .order_by(User.updated_at, User.id)
+            .limit(limit)
+        )
+        deletions = (
+            select(
+                UserTombstone.user_id,
+                UserTombstone.deleted_at,
+                true().label("deleted"),
+                # Typed, since an untyped NULL in a subquery becomes text on
+                # PostgreSQL and would not union with a timestamp.
+                null().cast(User.name.type).label("name"),
+                null().cast(User.surname.type).label("surname"),
+                null().cast(User.created_at.type).label("created_at"),
+            )
+            .where(
+                tuple_(UserTombstone.deleted_at, UserTombstone.user_id) > after,
+                UserTombstone.deleted_at <= until,
+            )
+            .order_by(UserTombstone.deleted_at, UserTombstone.user_id)
+            .limit(limit)
+        )
+        changes = union_all(
+            select(upserts.subquery()),
+            select(deletions.subquery()),
+        ).subquery()
+        result = await self.session.execute(
+            select(changes).order_by(changes.c.changed_at, changes.c.id).limit(limit)
+        )
+        return list(result.all())
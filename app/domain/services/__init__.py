@@ -1,3 +1,4 @@
-from .user_service import UserService
+from .user_loader import UserLoader
+from .user_service import ChangeCursorExpired, IdempotencyKeyConflict, UserService, user_loader
 
-__all__ = ["UserService"]
+__all__ = ["UserService", "UserLoader", "user_loader", "IdempotencyKeyConflict", "ChangeCursorExpired"]
@@ -0,0 +1,81 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Optional
+
+from app.schemas import UserResponse
+
+BatchLoadFn = Callable[[list[int]], Awaitable[dict[int, UserResponse]]]
+GenerationFn = Callable[[], int]
+
+
+class UserLoader:
+    def __init__(self, batch_load: BatchLoadFn, generation: GenerationFn = lambda: 0):
+        self.batch_load = batch_load
+        self.generation = generation
+        self._pending: dict[int, asyncio.Future] = {}
+        self._in_flight: dict[int, tuple[int, asyncio.Future]] = {}
+        self._dispatch_scheduled = False
+        self._tasks: set[asyncio.Task] = set()
+        self.batches_total = 0
+        self.loads_total = 0
+        self.coalesced_total = 0
+    
+    async def load(self, user_id: int) -> Optional[UserResponse]:
+        self.loads_total += 1
+        future = self._pending.get(user_id)
+        if future is None and user_id in self._in_flight:
+            # A batch dispatched before the latest invalidation may have read
+            # a row that a committed write has replaced since; only batches
+            # of the current generation are joined.
+            generation, in_flight = self._in_flight[user_id]
+            if generation == self.generation():
+                future = in_flight
+        if future is not None:
+            self.coalesced_total += 1
+        else:
+            loop = asyncio.get_running_loop()
+            future = self._pending[user_id] = loop.create_future()
+            if not self._dispatch_scheduled:
+                # Lookups arriving before this callback runs join one batch.
+                loop.call_soon(self._dispatch)
+                self._dispatch_scheduled = True
+        
+        # A cancelled caller must not cancel the lookup other callers share.
+        return await asyncio.shield(future)
+    
+    def _dispatch(self):
+        batch, self._pending = self._pending, {}
+        self._dispatch_scheduled = False
+        generation = self.generation()
+        self._in_flight.update((user_id, (generation, future)) for user_id, future in batch.items())
+        self.batches_total += 1
+        task = asyncio.create_task(self._load_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _load_batch(self, batch: dict[int, asyncio.Future]):
+        try:
+            users = await self.batch_load(list(batch))
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+                # Mark as retrieved: callers that went away must not trigger
+                # "exception was never retrieved" warnings.
+                future.exception()
+        else:
+            for user_id, future in batch.items():
+                if not future.done():
+                    future.set_result(users.get(user_id))
+        finally:
+            for user_id, future in batch.items():
+                if user_id in self._in_flight and self._in_flight[user_id][1] is future:
+                    del self._in_flight[user_id]
+    
+    def stats(self) -> dict[str, int]:
+        return {
+            "in_flight": len(self._in_flight),
+            "loads_total": self.loads_total,
+            "batches_total": self.batches_total,
+            "coalesced_total": self.coalesced_total,
+        }
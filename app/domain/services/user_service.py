@@ -1,100 +1,404 @@
+import time
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
+import msgspec
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import settings
 from app.domain.models import User
-from app.domain.repositories import AsyncUserRepository
+from app.domain.repositories import (
+    AsyncIdempotencyRepository,
+    AsyncOutboxRepository,
+    AsyncpgUserRepository,
+    AsyncUserRepository,
+)
+from app.domain.services.user_loader import UserLoader
+from app.infrastructure.cache import user_cache
+from app.infrastructure.database import replica_router
 from app.infrastructure.logging import get_logger, get_trace_id
-from app.infrastructure.messaging import EventType, event_producer
-from app.schemas import UserCreate, UserUpdate
+from app.infrastructure.messaging import EventType, outbox_relay
+from app.schemas import UserChange, UserCreate, UserPatch, UserResponse, UserUpdate
 
 logger = get_logger(__name__)
 
+IDEMPOTENCY_CLAIM_ATTEMPTS = 3
+
+# Monotonic deadlines of the next sweep of expired rows, per table.
+_next_purge: dict[str, float] = {}
+
+
+def _purge_due(name: str, interval: float) -> bool:
+    now = time.monotonic()
+    if now < _next_purge.get(name, 0.0):
+        return False
+    _next_purge[name] = now + interval
+    return True
+
+
+class IdempotencyKeyConflict(Exception):
+    pass
+
+
+class ChangeCursorExpired(Exception):
+    pass
+
+
+def to_user_response(user: User) -> UserResponse:
+    return UserResponse(
+        id=user.id,
+        name=user.name,
+        surname=user.surname,
+        created_at=user.created_at,
+        updated_at=user.updated_at,
+    )
+
 
 class UserService:
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, consistent_reads: bool = False):
         self.repository = AsyncUserRepository(session)
+        self.outbox = AsyncOutboxRepository(session)
+        self.idempotency = AsyncIdempotencyRepository(session)
         self.session = session
+        # Set for requests that must see their own recent writes: reads then
+        # skip the shared cache and loader, which may hold replica data.
+        self.consistent_reads = consistent_reads
+        # The shared cache is only filled from the primary: a lagging replica
+        # could hand back a row older than the last invalidation and keep it
+        # cached for the whole TTL.
+        self.caches_reads = not replica_router.is_replica(session)
+        self.read_repository: AsyncpgUserRepository | None = None
+        if settings.read_fast_path and session.bind.dialect.driver == "asyncpg":
+            self.read_repository = AsyncpgUserRepository(session)
     
-    async def create_user(self, user_data: UserCreate) -> User:
-        user = User(
-            name=user_data.name,
-            surname=user_data.surname,
-            password=user_data.password
+    async def _record_events(
+        self,
+        event_type: EventType,
+        payloads: list[tuple[int, dict | None]]
+    ):
+        # Events are written in the same transaction as the change and
+        # published later by the outbox relay.
+        trace_id = get_trace_id() or "unknown"
+        await self.outbox.add_many(
+            [
+                {
+                    "event_type": event_type.value,
+                    "user_id": user_id,
+                    "trace_id": trace_id,
+                    "data": data,
+                }
+                for user_id, data in payloads
+            ]
         )
+    
+    async def claim_idempotency_key(self, key: str, fingerprint: str) -> Optional[Row]:
+        # Returns the record of an earlier request with this key, or None once
+        # the key is claimed for this request. The claim commits together with
+        # the change it guards and vanishes with it on rollback.
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.idempotency_ttl)
+        if _purge_due("idempotency_keys", settings.idempotency_purge_interval):
+            await self.idempotency.purge(cutoff)
+        
+        for _ in range(IDEMPOTENCY_CLAIM_ATTEMPTS):
+            record = await self.idempotency.get(key, cutoff)
+            if record is not None:
+                break
+            if await self.idempotency.claim(key, fingerprint, cutoff):
+                return None
+            # The claim lost to a request holding the key, yet its record is
+            # not readable (expired or purged meanwhile): look again.
+        else:
+            await self.session.rollback()
+            raise IdempotencyKeyConflict(key)
         
-        user = await self.repository.create(user)
+        # Nothing to roll back but the read; frees the connection early.
+        await self.session.rollback()
+        logger.info("Idempotent request replayed", idempotency_key=key)
+        return record
+    
+    async def _complete_idempotency_key(self, key: Optional[str], user: User) -> None:
+        if key is None:
+            return
+        # The change must not commit without the record that guards retries.
+        if not await self.idempotency.complete(key, msgspec.json.encode(to_user_response(user))):
+            await self.session.rollback()
+            raise IdempotencyKeyConflict(key)
+    
+    async def create_user(self, user_data: UserCreate, idempotency_key: Optional[str] = None) -> User:
+        user = await self.repository.create(
+            {
+                "name": user_data.name,
+                "surname": user_data.surname,
+                "password": user_data.password,
+            }
+        )
+        await self._record_events(
+            EventType.USER_CREATED,
+            [(user.id, {"name": user.name, "surname": user.surname})]
+        )
+        await self._complete_idempotency_key(idempotency_key, user)
         await self.session.commit()
+        outbox_relay.notify()
         
         logger.info("User created", user_id=user.id)
         
-        trace_id = get_trace_id() or "unknown"
-        await event_producer.publish_event(
-            event_type=EventType.USER_CREATED,
-            user_id=user.id,
-            trace_id=trace_id,
-            data={"name": user.name, "surname": user.surname}
+        return user
+    
+    async def create_users(self, users_data: list[UserCreate]) -> list[User]:
+        users = await self.repository.create_many(
+            [
+                {"name": user_data.name, "surname": user_data.surname, "password": user_data.password}
+                for user_data in users_data
+            ]
         )
+        await self._record_events(
+            EventType.USER_CREATED,
+            [(user.id, {"name": user.name, "surname": user.surname}) for user in users]
+        )
+        await self.session.commit()
+        outbox_relay.notify()
         
-        return user
+        logger.info("Users created", count=len(users))
+        
+        return users
+    
+    async def _fetch_users(self, user_ids: list[int]) -> dict[int, UserResponse]:
+        if self.read_repository is not None:
+            users = await self.read_repository.get_many(user_ids)
+        else:
+            users = [to_user_response(user) for user in await self.repository.get_many(user_ids)]
+        return {user.id: user for user in users}
     
-    async def get_user(self, user_id: int) -> Optional[User]:
-        user = await self.repository.get_by_id(user_id)
-        if user:
-            logger.info("User retrieved", user_id=user_id)
+    async def get_user(self, user_id: int) -> Optional[UserResponse]:
+        cached = None if self.consistent_reads else user_cache.get(user_id)
+        if cached is not None:
+            logger.info("User retrieved", user_id=user_id, cache="hit")
+            return cached
+        
+        generation = user_cache.generation
+        # The loader fills the cache itself when its batch hit the primary.
+        cacheable = self.caches_reads
+        if settings.user_loader_enabled and not self.consistent_reads:
+            response = await user_loader.load(user_id)
+            cacheable = False
+        elif self.read_repository is not None:
+            response = await self.read_repository.get_by_id(user_id)
         else:
+            user = await self.repository.get_by_id(user_id)
+            response = to_user_response(user) if user else None
+        if not response:
             logger.warning("User not found", user_id=user_id)
-        return user
+            return None
+        
+        if cacheable:
+            user_cache.set(user_id, response, generation=generation)
+        logger.info("User retrieved", user_id=user_id, cache="miss")
+        return response
+    
+    async def get_user_version(self, user_id: int) -> Optional[datetime]:
+        cached = None if self.consistent_reads else user_cache.get(user_id)
+        if cached is not None:
+            return cached.updated_at
+        return await self.repository.get_updated_at(user_id)
     
-    async def list_users(self, limit: int = 100, offset: int = 0) -> list[User]:
-        users = await self.repository.get_all(limit=limit, offset=offset)
+    async def get_users(self, user_ids: list[int]) -> list[UserResponse]:
+        found: dict[int, UserResponse] = {}
+        missing = []
+        for user_id in user_ids:
+            cached = None if self.consistent_reads else user_cache.get(user_id)
+            if cached is not None:
+                found[user_id] = cached
+            else:
+                missing.append(user_id)
+        
+        if missing:
+            generation = user_cache.generation
+            fetched = await self._fetch_users(missing)
+            if self.caches_reads:
+                for user_id, user in fetched.items():
+                    user_cache.set(user_id, user, generation=generation)
+            found.update(fetched)
+        
+        logger.info("Users retrieved", requested=len(user_ids), found=len(found))
+        return [found[user_id] for user_id in user_ids if user_id in found]
+    
+    async def list_users(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        after: tuple[datetime, int] | None = None,
+    ) -> list[UserResponse]:
+        if self.read_repository is not None:
+            users = await self.read_repository.get_all(limit=limit, offset=offset, after=after)
+        else:
+            users = [
+                to_user_response(user)
+                for user in await self.repository.get_all(limit=limit, offset=offset, after=after)
+            ]
         logger.info("Users listed", count=len(users))
         return users
     
-    async def update_user(self, user_id: int, user_data: UserUpdate) -> Optional[User]:
-        user = await self.repository.get_by_id(user_id)
+    async def list_user_versions(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        after: tuple[datetime, int] | None = None,
+    ) -> list[Row]:
+        return await self.repository.get_versions(limit=limit, offset=offset, after=after)
+    
+    async def list_changes(
+        self,
+        after: tuple[datetime, int],
+        limit: int = 100,
+    ) -> tuple[list[UserChange], datetime]:
+        # A cursor from before the last purge may have missed the deletions it
+        # removed; reading from the start is a full resync and needs no
+        # tombstones.
+        purged_before = await self.repository.get_tombstones_purged_before()
+        epoch = datetime.fromtimestamp(0, timezone.utc)
+        if purged_before is not None and epoch < after[0] < purged_before:
+            raise ChangeCursorExpired()
+        # Rows younger than the settle delay are held back: their transaction
+        # may commit after a later-stamped one and would be skipped otherwise.
+        until = datetime.now(timezone.utc) - timedelta(seconds=settings.changes_settle_delay)
+        rows = await self.repository.get_changes(after=after, until=until, limit=limit)
+        changes = [
+            UserChange(id=row.id, changed_at=row.changed_at, deleted=True)
+            if row.deleted
+            else UserChange(
+                id=row.id,
+                changed_at=row.changed_at,
+                user=UserResponse(
+                    id=row.id,
+                    name=row.name,
+                    surname=row.surname,
+                    created_at=row.created_at,
+                    updated_at=row.changed_at,
+                ),
+            )
+            for row in rows
+        ]
+        logger.info("User changes listed", count=len(changes))
+        return changes, until
+    
+    async def export_users(self, fetch_size: int = 1000) -> AsyncIterator[Sequence[Row]]:
+        count = 0
+        async for rows in self.repository.stream_all(fetch_size=fetch_size):
+            count += len(rows)
+            yield rows
+        logger.info("Users exported", count=count)
+    
+    async def update_user(
+        self,
+        user_id: int,
+        user_data: UserUpdate,
+        idempotency_key: Optional[str] = None,
+    ) -> Optional[User]:
+        values = {
+            field: value
+            for field in ("name", "surname", "password")
+            if (value := getattr(user_data, field)) is not None
+        }
+        
+        user = await self.repository.update(user_id, values)
         if not user:
+            await self.session.rollback()
             logger.warning("User not found for update", user_id=user_id)
             return None
         
-        if user_data.name is not None:
-            user.name = user_data.name
-        if user_data.surname is not None:
-            user.surname = user_data.surname
-        if user_data.password is not None:
-            user.password = user_data.password
-        
-        user = await self.repository.update(user)
+        await self._record_events(
+            EventType.USER_UPDATED,
+            [(user.id, {"name": user.name, "surname": user.surname})]
+        )
+        await self._complete_idempotency_key(idempotency_key, user)
         await self.session.commit()
+        user_cache.invalidate(user_id)
+        outbox_relay.notify()
         
         logger.info("User updated", user_id=user_id)
         
-        trace_id = get_trace_id() or "unknown"
-        await event_producer.publish_event(
-            event_type=EventType.USER_UPDATED,
-            user_id=user.id,
-            trace_id=trace_id,
-            data={"name": user.name, "surname": user.surname}
+        return user
+    
+    async def update_users(self, patches: list[UserPatch]) -> list[User]:
+        users = await self.repository.update_many(
+            [
+                {"id": patch.id, "name": patch.name, "surname": patch.surname, "password": patch.password}
+                for patch in patches
+            ]
         )
+        if not users:
+            await self.session.rollback()
+            logger.warning("No users found for batch update", requested=len(patches))
+            return []
         
-        return user
+        await self._record_events(
+            EventType.USER_UPDATED,
+            [(user.id, {"name": user.name, "surname": user.surname}) for user in users]
+        )
+        await self.session.commit()
+        for user in users:
+            user_cache.invalidate(user.id)
+        outbox_relay.notify()
+        
+        logger.info("Users updated", requested=len(patches), count=len(users))
+        
+        return users
+    
+    async def _add_tombstones(self, user_ids: list[int]) -> None:
+        await self.repository.add_tombstones(user_ids)
+        if _purge_due("user_tombstones", settings.changes_tombstone_purge_interval):
+            await self.repository.purge_tombstones(
+                datetime.now(timezone.utc) - timedelta(seconds=settings.changes_tombstone_ttl)
+            )
     
     async def delete_user(self, user_id: int) -> bool:
-        user = await self.repository.get_by_id(user_id)
-        if not user:
+        deleted = await self.repository.delete(user_id)
+        if not deleted:
+            await self.session.rollback()
             logger.warning("User not found for deletion", user_id=user_id)
             return False
         
-        await self.repository.delete(user)
+        await self._add_tombstones([user_id])
+        await self._record_events(EventType.USER_DELETED, [(user_id, None)])
         await self.session.commit()
+        user_cache.invalidate(user_id)
+        outbox_relay.notify()
         
         logger.info("User deleted", user_id=user_id)
         
-        trace_id = get_trace_id() or "unknown"
-        await event_producer.publish_event(
-            event_type=EventType.USER_DELETED,
-            user_id=user_id,
-            trace_id=trace_id
-        )
-        
         return True
+    
+    async def delete_users(self, user_ids: list[int]) -> list[int]:
+        deleted = await self.repository.delete_many(user_ids)
+        if not deleted:
+            await self.session.rollback()
+            logger.warning("No users found for batch deletion", requested=len(user_ids))
+            return []
+        
+        await self._add_tombstones(deleted)
+        await self._record_events(EventType.USER_DELETED, [(user_id, None) for user_id in deleted])
+        await self.session.commit()
+        for user_id in deleted:
+            user_cache.invalidate(user_id)
+        outbox_relay.notify()
+        
+        logger.info("Users deleted", requested=len(user_ids), count=len(deleted))
+        
+        return deleted
+
+
+async def _load_users(user_ids: list[int]) -> dict[int, UserResponse]:
+    # Runs on its own session: the batch serves several requests at once.
+    generation = user_cache.generation
+    async with replica_router.session() as session:
+        user_service = UserService(session)
+        users = await user_service._fetch_users(user_ids)
+    if user_service.caches_reads:
+        for user_id, user in users.items():
+            user_cache.set(user_id, user, generation=generation)
+    return users
+
+
+user_loader = UserLoader(_load_users, generation=lambda: user_cache.generation)
@@ -0,0 +1,3 @@
+from .user_cache import LRUCache, user_cache
+
+__all__ = ["LRUCache", "user_cache"]
@@ -0,0 +1,75 @@
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, TypeVar
+
+from app.core import settings
+from app.schemas import UserResponse
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+    
+    def get(self, key: K) -> V | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+    
+    def set(self, key: K, value: V, generation: int | None = None) -> None:
+        # A read that started before an invalidation must not store what it
+        # loaded, otherwise the stale value would outlive the invalidation.
+        if not self.enabled or (generation is not None and generation != self.generation):
+            return
+        
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def invalidate(self, key: K) -> None:
+        self.generation += 1
+        self._entries.pop(key, None)
+    
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+    
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits_total": self.hits,
+            "misses_total": self.misses,
+            "evictions_total": self.evictions,
+        }
+
+
+user_cache: LRUCache[int, UserResponse] = LRUCache(
+    max_size=settings.user_cache_max_size,
+    ttl=settings.user_cache_ttl,
+)
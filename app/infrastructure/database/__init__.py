@@ -1,3 +1,18 @@
-from .config import sqlalchemy_config
+from .config import engine, sqlalchemy_config
+from .instrumentation import observe_request, query_counters, record_query, start_query_stats
+from .pool import ping, pool_stats, prewarm_pool
+from .replicas import ReplicaRouter, replica_router
 
-__all__ = ["sqlalchemy_config"]
+__all__ = [
+    "engine",
+    "sqlalchemy_config",
+    "observe_request",
+    "query_counters",
+    "record_query",
+    "start_query_stats",
+    "ping",
+    "pool_stats",
+    "prewarm_pool",
+    "ReplicaRouter",
+    "replica_router",
+]
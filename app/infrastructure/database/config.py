@@ -3,13 +3,44 @@ from advanced_alchemy.extensions.litestar import (
     AsyncSessionConfig,
     SQLAlchemyAsyncConfig,
 )
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
 
 from app.core import settings
+from app.infrastructure.database.instrumentation import install_query_instrumentation
+from app.infrastructure.database.pool import InstrumentedAsyncPool
+
+
+def engine_options(database_url: str) -> dict:
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return {}
+    
+    options = {
+        "poolclass": InstrumentedAsyncPool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+    if url.get_backend_name() == "postgresql":
+        options["connect_args"] = {
+            "prepared_statement_cache_size": settings.db_statement_cache_size,
+        }
+    return options
+
+
+# A single engine shared by the plugin and by code running outside the
+# request-scoped session (streams, background tasks): without an explicit
+# instance every config.get_session() call would build a new engine and pool.
+engine = create_async_engine(settings.database_url, **engine_options(settings.database_url))
+install_query_instrumentation(engine)
 
 session_config = AsyncSessionConfig(expire_on_commit=False)
 
 sqlalchemy_config = SQLAlchemyAsyncConfig(
-    connection_string=settings.database_url,
+    engine_instance=engine,
     session_config=session_config,
     alembic_config=AlembicAsyncConfig(
         script_config="alembic.ini",
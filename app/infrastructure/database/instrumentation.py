@@ -0,0 +1,123 @@
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core import settings
+from app.infrastructure.logging import get_logger
+from app.infrastructure.metrics import metrics_registry
+
+logger = get_logger(__name__)
+
+QUERY_COUNT_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+query_duration = metrics_registry.histogram(
+    "db_query_duration_seconds",
+    "Duration of a single SQL statement",
+    (),
+)
+request_query_count = metrics_registry.histogram(
+    "db_request_queries",
+    "SQL statements issued by one HTTP request",
+    ("route",),
+    QUERY_COUNT_BUCKETS,
+)
+request_db_time = metrics_registry.histogram(
+    "db_request_time_seconds",
+    "Time one HTTP request spent executing SQL",
+    ("route",),
+)
+
+
+class QueryStats:
+    __slots__ = ("queries", "db_time", "wait_time")
+    
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.wait_time = 0.0
+
+
+# Lives next to trace_id_var: the middleware starts one per request and the
+# engine and pool events, which run in the request's context, add to it.
+query_stats_var: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+class QueryCounters:
+    slow_queries_total = 0
+    budget_exceeded_total = 0
+
+
+def start_query_stats() -> QueryStats:
+    stats = QueryStats()
+    query_stats_var.set(stats)
+    return stats
+
+
+def record_connection_wait(seconds: float) -> None:
+    stats = query_stats_var.get()
+    if stats is not None:
+        stats.wait_time += seconds
+
+
+def observe_request(stats: QueryStats, route: str, method: str) -> None:
+    request_query_count.observe(stats.queries, route)
+    request_db_time.observe(stats.db_time, route)
+    
+    if settings.db_query_budget > 0 and stats.queries > settings.db_query_budget:
+        QueryCounters.budget_exceeded_total += 1
+        logger.warning(
+            "Query budget exceeded",
+            method=method,
+            route=route,
+            queries=stats.queries,
+            budget=settings.db_query_budget
+        )
+
+
+def record_query(elapsed: float, statement: str, executemany: bool = False) -> None:
+    query_duration.observe(elapsed)
+    
+    stats = query_stats_var.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_time += elapsed
+    
+    if settings.db_slow_query_threshold > 0 and elapsed >= settings.db_slow_query_threshold:
+        QueryCounters.slow_queries_total += 1
+        logger.warning(
+            "Slow query",
+            duration_ms=round(elapsed * 1000, 3),
+            statement=statement[:1000],
+            executemany=executemany
+        )
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    record_query(elapsed, statement, executemany)
+
+
+def _handle_error(context):
+    started = context.connection.info.get("query_started") if context.connection else None
+    if started:
+        started.pop()
+
+
+def install_query_instrumentation(engine: AsyncEngine) -> None:
+    sync_engine = engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+
+def query_counters() -> dict[str, int]:
+    return {
+        "slow_queries_total": QueryCounters.slow_queries_total,
+        "query_budget_exceeded_total": QueryCounters.budget_exceeded_total,
+    }
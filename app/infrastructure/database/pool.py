@@ -0,0 +1,60 @@
+import asyncio
+import time
+from contextlib import AsyncExitStack
+
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.infrastructure.database.instrumentation import record_connection_wait
+from app.infrastructure.metrics import metrics_registry
+
+pool_wait_duration = metrics_registry.histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting for a database connection from the pool",
+    (),
+)
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    timeouts_total = 0
+    
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            InstrumentedAsyncPool.timeouts_total += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            pool_wait_duration.observe(waited)
+            record_connection_wait(waited)
+
+
+def pool_stats(engine: AsyncEngine) -> dict[str, float]:
+    pool = engine.pool
+    if not isinstance(pool, AsyncAdaptedQueuePool):
+        return {}
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "timeouts_total": InstrumentedAsyncPool.timeouts_total,
+    }
+
+
+async def prewarm_pool(engine: AsyncEngine, connections: int) -> int:
+    # Opening the connections concurrently and releasing them together
+    # leaves that many idle connections in the pool.
+    async with AsyncExitStack() as stack:
+        await asyncio.gather(
+            *(stack.enter_async_context(engine.connect()) for _ in range(connections))
+        )
+    return connections
+
+
+async def ping(engine: AsyncEngine) -> None:
+    async with engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
@@ -0,0 +1,136 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+
+from app.core import settings
+from app.infrastructure.database.config import engine_options, sqlalchemy_config
+from app.infrastructure.database.instrumentation import install_query_instrumentation
+from app.infrastructure.database.pool import ping
+from app.infrastructure.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def _read_urls(value: str) -> list[str]:
+    return [url.strip() for url in value.split(",") if url.strip()]
+
+
+class ReplicaRouter:
+    def __init__(
+        self,
+        urls: list[str],
+        health_interval: float = settings.db_replica_health_interval,
+        health_timeout: float = settings.db_replica_health_timeout,
+    ):
+        self.engines: list[AsyncEngine] = []
+        for url in urls:
+            engine = create_async_engine(url, **engine_options(url))
+            install_query_instrumentation(engine)
+            self.engines.append(engine)
+        self.health_interval = health_interval
+        self.health_timeout = health_timeout
+        self._healthy = [True] * len(self.engines)
+        self._next = 0
+        self._task: asyncio.Task | None = None
+        self.replica_reads_total = 0
+        self.primary_fallbacks_total = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return bool(self.engines)
+    
+    def _set_health(self, index: int, healthy: bool, error: str | None = None) -> None:
+        if self._healthy[index] == healthy:
+            return
+        self._healthy[index] = healthy
+        if healthy:
+            logger.info("Read replica is healthy again", replica=index)
+        else:
+            logger.warning("Read replica marked unhealthy", replica=index, error=error)
+    
+    def _candidates(self) -> list[int]:
+        # Round-robin start, healthy replicas only.
+        count = len(self.engines)
+        start = self._next % count
+        self._next += 1
+        return [
+            index
+            for index in ((start + offset) % count for offset in range(count))
+            if self._healthy[index]
+        ]
+    
+    def is_replica(self, session: AsyncSession) -> bool:
+        return session.bind in self.engines
+    
+    async def open_session(self) -> AsyncSession | None:
+        if not self.enabled:
+            return None
+        
+        for index in self._candidates():
+            session = AsyncSession(bind=self.engines[index], expire_on_commit=False)
+            try:
+                # Checking out the connection up front turns a dead replica into
+                # a fallback instead of a failed request.
+                await session.connection()
+            except Exception as e:
+                await session.close()
+                self._set_health(index, False, str(e))
+                continue
+            self.replica_reads_total += 1
+            return session
+        
+        self.primary_fallbacks_total += 1
+        return None
+    
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        session = await self.open_session()
+        if session is None:
+            async with sqlalchemy_config.get_session() as session:
+                yield session
+            return
+        try:
+            yield session
+        finally:
+            await session.close()
+    
+    async def _check(self, index: int) -> None:
+        try:
+            await asyncio.wait_for(ping(self.engines[index]), timeout=self.health_timeout)
+        except Exception as e:
+            self._set_health(index, False, str(e) or type(e).__name__)
+        else:
+            self._set_health(index, True)
+    
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_interval)
+            await asyncio.gather(*(self._check(index) for index in range(len(self.engines))))
+    
+    async def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for engine in self.engines:
+            await engine.dispose()
+    
+    def stats(self) -> dict[str, int]:
+        return {
+            "replicas": len(self.engines),
+            "healthy": sum(self._healthy),
+            "replica_reads_total": self.replica_reads_total,
+            "primary_fallbacks_total": self.primary_fallbacks_total,
+        }
+
+
+replica_router = ReplicaRouter(_read_urls(settings.database_read_url))
@@ -1,3 +1,3 @@
-from .config import bind_trace_id, configure_logging, get_logger, get_trace_id
+from .config import bind_trace_id, configure_logging, get_logger, get_trace_id, log_writer_stats
 
-__all__ = ["configure_logging", "get_logger", "bind_trace_id", "get_trace_id"]
+__all__ = ["configure_logging", "get_logger", "bind_trace_id", "get_trace_id", "log_writer_stats"]
@@ -4,8 +4,17 @@ from contextvars import ContextVar
 
 import structlog
 
+from app.core import settings
+from app.infrastructure.logging.writer import (
+    BackgroundLogWriter,
+    MsgspecRenderer,
+    QueueLoggerFactory,
+)
+
 trace_id_var: ContextVar[str | None] = ContextVar("trace_id", default=None)
 
+_writer: BackgroundLogWriter | None = None
+
 
 def add_trace_id(logger, method_name, event_dict):
     trace_id = trace_id_var.get()
@@ -15,23 +24,45 @@ def add_trace_id(logger, method_name, event_dict):
 
 
 def configure_logging():
+    global _writer
+    
+    processors = [
+        structlog.contextvars.merge_contextvars,
+        structlog.processors.add_log_level,
+        structlog.processors.TimeStamper(fmt="iso"),
+        add_trace_id,
+        structlog.processors.StackInfoRenderer(),
+        structlog.processors.format_exc_info,
+    ]
+    
+    if settings.log_writer == "background":
+        # Rendering to bytes is cheap; the actual write happens on a separate
+        # thread so the event loop never blocks on stdout.
+        _writer = BackgroundLogWriter(
+            queue_size=settings.log_queue_size,
+            batch_size=settings.log_batch_size,
+            policy=settings.log_queue_policy,
+        )
+        processors.append(MsgspecRenderer())
+        logger_factory = QueueLoggerFactory(_writer)
+    else:
+        processors.append(structlog.processors.JSONRenderer())
+        logger_factory = structlog.PrintLoggerFactory(file=sys.stdout)
+    
     structlog.configure(
-        processors=[
-            structlog.contextvars.merge_contextvars,
-            structlog.processors.add_log_level,
-            structlog.processors.TimeStamper(fmt="iso"),
-            add_trace_id,
-            structlog.processors.StackInfoRenderer(),
-            structlog.processors.format_exc_info,
-            structlog.processors.JSONRenderer()
-        ],
+        processors=processors,
         wrapper_class=structlog.make_filtering_bound_logger(logging.INFO),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(file=sys.stdout),
+        logger_factory=logger_factory,
         cache_logger_on_first_use=True,
     )
 
 
+def log_writer_stats() -> dict[str, int]:
+    # Empty with the synchronous writer, which never drops lines.
+    return _writer.stats() if _writer is not None else {}
+
+
 def get_logger(name: str):
     return structlog.get_logger(name)
 
@@ -0,0 +1,102 @@
+import atexit
+import queue
+import sys
+import threading
+from typing import BinaryIO
+
+import msgspec
+
+LOG_QUEUE_POLICY_DROP = "drop"
+LOG_QUEUE_POLICY_BLOCK = "block"
+
+
+class MsgspecRenderer:
+    def __init__(self):
+        self._encoder = msgspec.json.Encoder(enc_hook=str)
+
+    def __call__(self, logger, method_name, event_dict) -> bytes:
+        return self._encoder.encode(event_dict)
+
+
+class BackgroundLogWriter:
+    def __init__(
+        self,
+        file: BinaryIO | None = None,
+        queue_size: int = 10_000,
+        batch_size: int = 256,
+        policy: str = LOG_QUEUE_POLICY_DROP
+    ):
+        if policy not in (LOG_QUEUE_POLICY_DROP, LOG_QUEUE_POLICY_BLOCK):
+            raise ValueError(f"Unknown log queue policy: {policy}")
+
+        self.file = file or sys.stdout.buffer
+        self.batch_size = batch_size
+        self.policy = policy
+        self.dropped = 0
+        self._queue: queue.Queue[bytes | None] = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, line: bytes) -> None:
+        if self.policy == LOG_QUEUE_POLICY_BLOCK:
+            self._queue.put(line)
+            return
+        try:
+            self._queue.put_nowait(line)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        while True:
+            line = self._queue.get()
+            if line is None:
+                return
+
+            # Drain whatever else is already queued and write it in one call.
+            lines = [line]
+            while len(lines) < self.batch_size:
+                try:
+                    line = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if line is None:
+                    self._flush(lines)
+                    return
+                lines.append(line)
+            self._flush(lines)
+
+    def _flush(self, lines: list[bytes]) -> None:
+        lines.append(b"")
+        self.file.write(b"\n".join(lines))
+        self.file.flush()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "queued": self._queue.qsize(),
+            "dropped_total": self.dropped,
+        }
+
+    def close(self, timeout: float = 5.0) -> None:
+        if not self._thread.is_alive():
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+
+class QueueLogger:
+    def __init__(self, writer: BackgroundLogWriter):
+        self._writer = writer
+
+    def msg(self, message: bytes) -> None:
+        self._writer.write(message)
+
+    log = debug = info = warn = warning = error = critical = exception = fatal = msg
+
+
+class QueueLoggerFactory:
+    def __init__(self, writer: BackgroundLogWriter):
+        self._logger = QueueLogger(writer)
+
+    def __call__(self, *args) -> QueueLogger:
+        return self._logger
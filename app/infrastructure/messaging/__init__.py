@@ -1,5 +1,19 @@
+from .batching import EventBatchHandler, LoggingEventBatchHandler
+from .codec import EventDecoder, EventEncoder
 from .consumer import event_consumer
-from .events import EventType, UserEvent
+from .events import EventType, UserData, UserEvent
+from .outbox_relay import outbox_relay
 from .producer import event_producer
 
-__all__ = ["EventType", "UserEvent", "event_producer", "event_consumer"]
+__all__ = [
+    "EventType",
+    "UserData",
+    "UserEvent",
+    "EventEncoder",
+    "EventDecoder",
+    "EventBatchHandler",
+    "LoggingEventBatchHandler",
+    "event_producer",
+    "event_consumer",
+    "outbox_relay",
+]
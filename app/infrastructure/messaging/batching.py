@@ -0,0 +1,120 @@
+import asyncio
+from collections import Counter, deque
+from typing import Protocol
+
+import msgspec
+from aio_pika.abc import AbstractIncomingMessage
+
+from app.infrastructure.logging import get_logger
+from app.infrastructure.messaging.codec import EventDecoder
+from app.infrastructure.messaging.events import UserEvent
+
+logger = get_logger(__name__)
+
+
+class EventBatchHandler(Protocol):
+    async def handle(self, events: list[UserEvent]) -> None:
+        ...
+
+
+class LoggingEventBatchHandler:
+    async def handle(self, events: list[UserEvent]) -> None:
+        logger.info(
+            "Event batch received",
+            count=len(events),
+            event_types=dict(Counter(event.event_type.value for event in events))
+        )
+
+
+class EventBatcher:
+    def __init__(
+        self,
+        handler: EventBatchHandler,
+        batch_size: int,
+        batch_timeout: float,
+        concurrency: int
+    ):
+        self.handler = handler
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout
+        self.concurrency = concurrency
+        self._decoder = EventDecoder()
+        self._workers = asyncio.Semaphore(concurrency)
+        self._tasks: set[asyncio.Task] = set()
+        self._batch: list[tuple[AbstractIncomingMessage, UserEvent]] = []
+        self._flush_timer: asyncio.TimerHandle | None = None
+        # Deliveries in arrival order and the tags already settled. Acks are
+        # sent with multiple=True only up to the oldest unsettled delivery so
+        # that a slow batch is never acknowledged by a faster later one.
+        self._unacked: deque[AbstractIncomingMessage] = deque()
+        self._settled: set[int] = set()
+        self.processed_total = 0
+        self.failed_total = 0
+    
+    async def on_message(self, message: AbstractIncomingMessage):
+        try:
+            event = self._decoder.decode(message.body, message.content_type, message.headers)
+        except msgspec.DecodeError as e:
+            logger.error("Error decoding message", error=str(e))
+            await message.reject(requeue=False)
+            return
+        
+        self._unacked.append(message)
+        self._batch.append((message, event))
+        if len(self._batch) >= self.batch_size:
+            await self.flush()
+        elif self._flush_timer is None:
+            self._flush_timer = asyncio.get_running_loop().call_later(
+                self.batch_timeout, self._flush_on_timer
+            )
+    
+    def _flush_on_timer(self):
+        self._flush_timer = None
+        task = asyncio.create_task(self.flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def flush(self):
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if not self._batch:
+            return
+        
+        batch, self._batch = self._batch, []
+        await self._workers.acquire()
+        task = asyncio.create_task(self._process(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _process(self, batch: list[tuple[AbstractIncomingMessage, UserEvent]]):
+        try:
+            await self.handler.handle([event for _, event in batch])
+        except Exception as e:
+            self.failed_total += len(batch)
+            logger.error("Error processing event batch", count=len(batch), error=str(e))
+            for message, _ in batch:
+                await message.nack(requeue=True)
+        else:
+            self.processed_total += len(batch)
+        finally:
+            self._workers.release()
+        
+        self._settled.update(message.delivery_tag for message, _ in batch)
+        await self._ack_settled()
+    
+    async def _ack_settled(self):
+        last_ok = None
+        while self._unacked and self._unacked[0].delivery_tag in self._settled:
+            message = self._unacked.popleft()
+            self._settled.discard(message.delivery_tag)
+            # Nacked deliveries are already settled on the broker side.
+            if not message.processed:
+                last_ok = message
+        if last_ok is not None:
+            await last_ok.ack(multiple=True)
+    
+    async def close(self):
+        await self.flush()
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
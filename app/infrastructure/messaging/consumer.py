@@ -1,23 +1,71 @@
 import msgspec
 from aio_pika import Connection, connect_robust
-from aio_pika.abc import AbstractIncomingMessage
+from aio_pika.abc import AbstractIncomingMessage, AbstractQueue
 
 from app.core import settings
+from app.infrastructure.cache import user_cache
 from app.infrastructure.logging import bind_trace_id, get_logger
-from app.infrastructure.messaging.events import UserEvent
+from app.infrastructure.messaging.batching import (
+    EventBatcher,
+    EventBatchHandler,
+    LoggingEventBatchHandler,
+)
+from app.infrastructure.messaging.codec import EventDecoder
+from app.infrastructure.messaging.events import EventType
 
 logger = get_logger(__name__)
 
 
+CONSUMER_MODE_SINGLE = "single"
+CONSUMER_MODE_BATCH = "batch"
+
+
 class EventConsumer:
-    def __init__(self):
+    def __init__(
+        self,
+        mode: str = settings.consumer_mode,
+        handler: EventBatchHandler | None = None,
+        batch_size: int = settings.consumer_batch_size,
+        batch_timeout: float = settings.consumer_batch_timeout,
+        concurrency: int = settings.consumer_concurrency,
+    ):
+        if mode not in (CONSUMER_MODE_SINGLE, CONSUMER_MODE_BATCH):
+            raise ValueError(f"Unknown consumer mode: {mode}")
+        
         self.connection: Connection | None = None
+        self.queue: AbstractQueue | None = None
+        self.invalidation_queue: AbstractQueue | None = None
         self.exchange_name = "user_events"
+        self.mode = mode
+        self.decoder = EventDecoder()
+        self.batcher: EventBatcher | None = None
+        if mode == CONSUMER_MODE_BATCH:
+            self.batcher = EventBatcher(
+                handler or LoggingEventBatchHandler(),
+                batch_size=batch_size,
+                batch_timeout=batch_timeout,
+                concurrency=concurrency,
+            )
+    
+    @property
+    def prefetch_count(self) -> int:
+        if self.batcher is not None:
+            # Enough unacked deliveries to keep every worker busy with a full batch.
+            return self.batcher.batch_size * self.batcher.concurrency
+        return settings.consumer_prefetch_count
+    
+    @property
+    def is_connected(self) -> bool:
+        return (
+            self.connection is not None
+            and not self.connection.is_closed
+            and self.invalidation_queue is not None
+        )
     
     async def connect(self):
         self.connection = await connect_robust(settings.rabbitmq_url)
         self.channel = await self.connection.channel()
-        await self.channel.set_qos(prefetch_count=10)
+        await self.channel.set_qos(prefetch_count=self.prefetch_count)
         
         self.exchange = await self.channel.declare_exchange(
             self.exchange_name,
@@ -31,6 +79,16 @@ class EventConsumer:
         
         await self.queue.bind(self.exchange, routing_key="user.*")
         
+        # user_events_queue is shared, so each event reaches only one worker.
+        # Cache invalidation has to reach every worker: each one gets its own
+        # exclusive queue that is dropped together with the connection.
+        self.invalidation_queue = await self.channel.declare_queue(
+            exclusive=True,
+            auto_delete=True
+        )
+        for event_type in (EventType.USER_UPDATED, EventType.USER_DELETED):
+            await self.invalidation_queue.bind(self.exchange, routing_key=event_type.value)
+        
         logger.info("EventConsumer connected to RabbitMQ")
     
     async def start_consuming(self):
@@ -38,14 +96,25 @@ class EventConsumer:
             logger.error("Cannot start consuming: not connected")
             return
         
-        await self.queue.consume(self._process_message)
-        logger.info("EventConsumer started consuming messages")
+        if self.batcher is not None:
+            await self.queue.consume(self.batcher.on_message)
+        else:
+            await self.queue.consume(self._process_message)
+        await self.invalidation_queue.consume(self._process_invalidation, no_ack=True)
+        logger.info("EventConsumer started consuming messages", mode=self.mode)
     
     async def _process_message(self, message: AbstractIncomingMessage):
+        try:
+            event = self.decoder.decode(message.body, message.content_type, message.headers)
+        except msgspec.DecodeError as e:
+            # Redelivery cannot fix a malformed message or an unknown schema
+            # version: reject it for good (dead-lettered if the queue has a DLX).
+            logger.error("Rejecting undecodable message", error=str(e))
+            await message.reject(requeue=False)
+            return
+        
         async with message.process():
             try:
-                event = msgspec.json.decode(message.body, type=UserEvent)
-                
                 bind_trace_id(event.trace_id)
                 
                 logger.info(
@@ -54,11 +123,31 @@ class EventConsumer:
                     user_id=event.user_id,
                     timestamp=event.timestamp.isoformat()
                 )
-                
+            
             except Exception as e:
                 logger.error("Error processing message", error=str(e))
     
+    async def _process_invalidation(self, message: AbstractIncomingMessage):
+        try:
+            user_id = self.decoder.decode(message.body, message.content_type, message.headers).user_id
+        except msgspec.DecodeError as e:
+            # Dropping the message would leave a stale entry cached for the
+            # whole TTL: invalidate by user_id if it can be read, else everything.
+            user_id = self.decoder.peek_user_id(message.body, message.content_type)
+            logger.warning(
+                "Invalidating from undecodable message",
+                error=str(e),
+                user_id=user_id
+            )
+            if user_id is None:
+                user_cache.clear()
+                return
+        
+        user_cache.invalidate(user_id)
+    
     async def disconnect(self):
+        if self.batcher is not None:
+            await self.batcher.close()
         if self.connection:
             await self.connection.close()
         logger.info("EventConsumer disconnected from RabbitMQ")
@@ -10,9 +10,24 @@ class EventType(str, Enum):
     USER_DELETED = "user.deleted"
 
 
+class UserData(Struct):
+    name: str
+    surname: str
+
+
 class UserEvent(Struct):
     event_type: EventType
     user_id: int
     trace_id: str
     timestamp: datetime
-    data: dict | None = None
+    data: UserData | None = None
+
+
+# The msgpack layout: the same fields encoded positionally instead of by name.
+# Decoded events are still UserEvent instances.
+class PackedUserData(UserData, array_like=True):
+    pass
+
+
+class PackedUserEvent(UserEvent, array_like=True):
+    data: PackedUserData | None = None
@@ -0,0 +1,125 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+
+from app.core import settings
+from app.domain.repositories import AsyncOutboxRepository
+from app.infrastructure.database import sqlalchemy_config
+from app.infrastructure.logging import get_logger
+from app.infrastructure.messaging.events import EventType, UserData, UserEvent
+from app.infrastructure.messaging.producer import EventProducer, event_producer
+
+logger = get_logger(__name__)
+
+
+class OutboxRelay:
+    def __init__(self, producer: EventProducer, batch_size: int, poll_interval: float):
+        self.producer = producer
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._task: asyncio.Task | None = None
+        self._wakeup: asyncio.Event | None = None
+        self.published_total = 0
+        self.batches_total = 0
+        self.failures_total = 0
+        self.last_batch_size = 0
+        self.last_batch_duration = 0.0
+        self.last_lag = 0.0
+    
+    async def start(self):
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+            logger.info("OutboxRelay started", batch_size=self.batch_size)
+    
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._wakeup = None
+        logger.info("OutboxRelay stopped", published_total=self.published_total)
+    
+    def notify(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+    
+    async def _run(self):
+        wakeup = self._wakeup
+        while True:
+            relayed = 0
+            if self.producer.is_connected:
+                try:
+                    relayed = await self.relay_batch()
+                except Exception as e:
+                    self.failures_total += 1
+                    logger.error("Error relaying outbox batch", error=str(e))
+            
+            # A full batch means there is probably more waiting.
+            if relayed < self.batch_size:
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                wakeup.clear()
+    
+    async def relay_batch(self) -> int:
+        started = time.perf_counter()
+        async with sqlalchemy_config.get_session() as session:
+            repository = AsyncOutboxRepository(session)
+            rows = await repository.claim_batch(self.batch_size)
+            if not rows:
+                return 0
+            
+            await self.producer.publish_events(
+                [
+                    UserEvent(
+                        event_type=EventType(row.event_type),
+                        user_id=row.user_id,
+                        trace_id=row.trace_id,
+                        timestamp=row.created_at,
+                        data=UserData(**row.data) if row.data else None
+                    )
+                    for row in rows
+                ]
+            )
+            await repository.delete_many([row.id for row in rows])
+            await session.commit()
+        
+        self.published_total += len(rows)
+        self.batches_total += 1
+        self.last_batch_size = len(rows)
+        self.last_batch_duration = time.perf_counter() - started
+        self.last_lag = (datetime.now(timezone.utc) - rows[0].created_at).total_seconds()
+        
+        logger.info(
+            "Outbox batch relayed",
+            count=len(rows),
+            lag=round(self.last_lag, 3),
+            duration=round(self.last_batch_duration, 3)
+        )
+        return len(rows)
+    
+    def stats(self) -> dict[str, float]:
+        return {
+            "published_total": self.published_total,
+            "batches_total": self.batches_total,
+            "failures_total": self.failures_total,
+            "last_batch_size": self.last_batch_size,
+            "last_batch_duration_seconds": self.last_batch_duration,
+            "last_lag_seconds": self.last_lag,
+            "throughput_per_second": (
+                self.last_batch_size / self.last_batch_duration if self.last_batch_duration else 0.0
+            ),
+        }
+
+
+outbox_relay = OutboxRelay(
+    event_producer,
+    batch_size=settings.outbox_batch_size,
+    poll_interval=settings.outbox_poll_interval,
+)
@@ -1,44 +1,152 @@
+import asyncio
 from datetime import datetime, timezone
+from typing import Awaitable, Callable
 
-import msgspec
 from aio_pika import Connection, Message, connect_robust
-from aio_pika.abc import AbstractChannel
+from aio_pika.abc import AbstractChannel, AbstractExchange
 
 from app.core import settings
 from app.infrastructure.logging import get_logger
-from app.infrastructure.messaging.events import EventType, UserEvent
+from app.infrastructure.messaging.codec import SCHEMA_VERSION, SCHEMA_VERSION_HEADER, EventEncoder
+from app.infrastructure.messaging.events import EventType, UserData, UserEvent
 
 logger = get_logger(__name__)
 
+PUBLISH_MODE_DIRECT = "direct"
+PUBLISH_MODE_BUFFERED = "buffered"
+
 
 class EventProducer:
-    def __init__(self):
+    def __init__(
+        self,
+        mode: str = settings.event_publish_mode,
+        buffer_size: int = settings.event_buffer_size,
+        channel_pool_size: int = settings.event_channel_pool_size,
+        max_in_flight: int = settings.event_max_in_flight,
+        format: str = settings.event_format,
+        connection_factory: Callable[[str], Awaitable[Connection]] = connect_robust,
+    ):
+        if mode not in (PUBLISH_MODE_DIRECT, PUBLISH_MODE_BUFFERED):
+            raise ValueError(f"Unknown publish mode: {mode}")
+        
         self.connection: Connection | None = None
         self.channel: AbstractChannel | None = None
+        self.exchange: AbstractExchange | None = None
         self.exchange_name = "user_events"
+        self.mode = mode
+        self.buffer_size = buffer_size
+        self.channel_pool_size = max(channel_pool_size, 1)
+        self.max_in_flight = max(max_in_flight, 1)
+        self.connection_factory = connection_factory
+        self.encoder = EventEncoder(format)
+        
+        self._pool_channels: list[AbstractChannel] = []
+        self._buffer: asyncio.Queue | None = None
+        self._senders: list[asyncio.Task] = []
+        self._pending: set[asyncio.Task] = set()
+        self.published_total = 0
+        self.failed_total = 0
     
     async def connect(self):
-        self.connection = await connect_robust(settings.rabbitmq_url)
-        self.channel = await self.connection.channel()
+        self.connection = await self.connection_factory(settings.rabbitmq_url)
+        self.channel = await self.connection.channel(publisher_confirms=True)
         self.exchange = await self.channel.declare_exchange(
             self.exchange_name,
             durable=True
         )
-        logger.info("EventProducer connected to RabbitMQ")
+        
+        if self.mode == PUBLISH_MODE_BUFFERED:
+            exchanges = [self.exchange]
+            for _ in range(self.channel_pool_size - 1):
+                channel = await self.connection.channel(publisher_confirms=True)
+                self._pool_channels.append(channel)
+                exchanges.append(
+                    await channel.declare_exchange(self.exchange_name, durable=True)
+                )
+            
+            self._buffer = asyncio.Queue(maxsize=self.buffer_size)
+            self._senders = [
+                asyncio.create_task(self._sender(exchange)) for exchange in exchanges
+            ]
+        
+        logger.info("EventProducer connected to RabbitMQ", mode=self.mode, format=self.encoder.format)
     
-    async def disconnect(self):
+    async def disconnect(self, flush_timeout: float = 5.0):
+        if self._buffer is not None:
+            try:
+                await asyncio.wait_for(self._buffer.join(), timeout=flush_timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Event buffer not drained", pending=self._buffer.qsize())
+            tasks = [*self._senders, *self._pending]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._senders = []
+            self._buffer = None
+        
+        for channel in self._pool_channels:
+            await channel.close()
+        self._pool_channels = []
         if self.channel:
             await self.channel.close()
         if self.connection:
             await self.connection.close()
         logger.info("EventProducer disconnected from RabbitMQ")
     
+    @property
+    def is_connected(self) -> bool:
+        return self.channel is not None and not self.channel.is_closed and self.exchange is not None
+    
+    def _build_message(self, event: UserEvent) -> Message:
+        return Message(
+            body=self.encoder.encode(event),
+            content_type=self.encoder.content_type,
+            headers={"trace_id": event.trace_id, SCHEMA_VERSION_HEADER: SCHEMA_VERSION}
+        )
+    
+    async def _sender(self, exchange: AbstractExchange):
+        # Every channel keeps up to max_in_flight publishes awaiting their
+        # broker confirm instead of waiting for each one in turn.
+        in_flight = asyncio.Semaphore(self.max_in_flight)
+        while True:
+            message, routing_key, confirmation = await self._buffer.get()
+            await in_flight.acquire()
+            task = asyncio.create_task(
+                self._publish_confirmed(exchange, message, routing_key, confirmation, in_flight)
+            )
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+    
+    async def _publish_confirmed(
+        self,
+        exchange: AbstractExchange,
+        message: Message,
+        routing_key: str,
+        confirmation: asyncio.Future | None,
+        in_flight: asyncio.Semaphore
+    ):
+        try:
+            await exchange.publish(message, routing_key=routing_key)
+        except Exception as e:
+            self.failed_total += 1
+            if confirmation is None:
+                logger.error("Error publishing buffered event", routing_key=routing_key, error=str(e))
+            elif not confirmation.done():
+                confirmation.set_exception(e)
+        else:
+            self.published_total += 1
+            if confirmation is not None and not confirmation.done():
+                confirmation.set_result(None)
+        finally:
+            in_flight.release()
+            self._buffer.task_done()
+    
     async def publish_event(
         self,
         event_type: EventType,
         user_id: int,
         trace_id: str,
-        data: dict | None = None
+        data: UserData | None = None
     ):
         if not self.channel or not self.exchange:
             logger.warning("Cannot publish event: not connected")
@@ -52,17 +160,22 @@ class EventProducer:
             data=data
         )
         
-        message_body = msgspec.json.encode(event)
-        message = Message(
-            body=message_body,
-            content_type="application/json",
-            headers={"trace_id": trace_id}
-        )
+        if self._buffer is not None:
+            # Only blocks when the send buffer is full.
+            await self._buffer.put((self._build_message(event), event_type.value, None))
+            logger.debug(
+                "Event queued",
+                event_type=event_type.value,
+                user_id=user_id,
+                trace_id=trace_id
+            )
+            return
         
         await self.exchange.publish(
-            message,
+            self._build_message(event),
             routing_key=event_type.value
         )
+        self.published_total += 1
         
         logger.info(
             "Event published",
@@ -70,6 +183,44 @@ class EventProducer:
             user_id=user_id,
             trace_id=trace_id
         )
+    
+    async def publish_events(self, events: list[UserEvent]):
+        if not events:
+            return
+        if not self.channel or not self.exchange:
+            raise RuntimeError("EventProducer is not connected")
+        
+        if self._buffer is not None:
+            loop = asyncio.get_running_loop()
+            confirmations = []
+            for event in events:
+                confirmation = loop.create_future()
+                await self._buffer.put(
+                    (self._build_message(event), event.event_type.value, confirmation)
+                )
+                confirmations.append(confirmation)
+            await asyncio.gather(*confirmations)
+        else:
+            await asyncio.gather(
+                *(
+                    self.exchange.publish(
+                        self._build_message(event),
+                        routing_key=event.event_type.value
+                    )
+                    for event in events
+                )
+            )
+            self.published_total += len(events)
+        
+        logger.info("Events published", count=len(events))
+    
+    def stats(self) -> dict[str, int]:
+        return {
+            "buffered": self._buffer.qsize() if self._buffer is not None else 0,
+            "in_flight": len(self._pending),
+            "published_total": self.published_total,
+            "failed_total": self.failed_total,
+        }
 
 
 event_producer = EventProducer()
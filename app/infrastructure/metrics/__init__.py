@@ -0,0 +1,3 @@
+from .registry import Histogram, MetricsRegistry, http_request_duration, metrics_registry
+
+__all__ = ["Histogram", "MetricsRegistry", "metrics_registry", "http_request_duration"]
@@ -0,0 +1,114 @@
+import threading
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Mapping
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def _escape(value: object) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Mapping[str, object]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label_names: tuple[str, ...],
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS
+    ):
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self.buckets = buckets
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.description}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            snapshot = [
+                (label_values, list(counts), total, count)
+                for label_values, (counts, total, count) in self._series.items()
+            ]
+        for label_values, counts, total, count in sorted(snapshot):
+            labels = dict(zip(self.label_names, label_values))
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += bucket_count
+                yield f"{self.name}_bucket{_format_labels({**labels, 'le': bound})} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(labels)} {count}"
+
+
+class MetricsRegistry:
+    def __init__(self, namespace: str = "app"):
+        self.namespace = namespace
+        self._histograms: list[Histogram] = []
+        self._collectors: dict[str, Callable[[], Mapping[str, float]]] = {}
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        label_names: tuple[str, ...],
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS
+    ) -> Histogram:
+        histogram = Histogram(f"{self.namespace}_{name}", description, label_names, buckets)
+        self._histograms.append(histogram)
+        return histogram
+
+    def register_collector(self, subsystem: str, collect: Callable[[], Mapping[str, float]]) -> None:
+        # A collector returns a flat mapping of current values; keys ending
+        # in _total are exported as counters, everything else as gauges.
+        self._collectors[subsystem] = collect
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for histogram in self._histograms:
+            lines.extend(histogram.render())
+        for subsystem, collect in self._collectors.items():
+            for key, value in collect().items():
+                name = f"{self.namespace}_{subsystem}_{key}"
+                metric_type = "counter" if key.endswith("_total") else "gauge"
+                lines.append(f"# TYPE {name} {metric_type}")
+                lines.append(f"{name} {_format_value(value)}")
+        lines.append("")
+        return "\n".join(lines)
+
+
+metrics_registry = MetricsRegistry()
+
+http_request_duration = metrics_registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route and status",
+    ("method", "route", "status"),
+)
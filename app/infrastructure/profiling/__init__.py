@@ -0,0 +1,3 @@
+from .profiler import RequestProfiler, request_profiler
+
+__all__ = ["RequestProfiler", "request_profiler"]
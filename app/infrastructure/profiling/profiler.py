@@ -0,0 +1,127 @@
+import asyncio
+import cProfile
+import random
+import re
+import secrets
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from app.core import settings
+from app.infrastructure.logging import get_logger
+
+logger = get_logger(__name__)
+
+PROFILE_SUFFIX = ".pstats"
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+class RequestProfiler:
+    def __init__(
+        self,
+        enabled: bool = settings.profiling_enabled,
+        token: str = settings.profiling_token,
+        directory: str = settings.profiling_dir,
+        sample_rate: float = settings.profiling_sample_rate,
+        max_files: int = settings.profiling_max_files,
+    ):
+        self.enabled = enabled and bool(token)
+        self.token = token
+        self.directory = Path(directory)
+        self.sample_rate = sample_rate
+        self.max_files = max_files
+        # cProfile hooks the whole thread and only one profiler can be active
+        # at a time: a request flagged while another is being profiled runs
+        # unprofiled. Other requests interleaved on the loop still show up in
+        # the profile, so it is cleanest on a quiet instance.
+        self._busy = False
+        self.profiled_total = 0
+        self.skipped_total = 0
+    
+    def authorized(self, value: str | None) -> bool:
+        # Bytes, since compare_digest rejects non-ASCII str: header values are
+        # latin-1, and a crafted one must not turn into a 500.
+        return (
+            self.enabled
+            and value is not None
+            and secrets.compare_digest(value.encode("latin-1", "replace"), self.token.encode())
+        )
+    
+    def wants(self, header: str | None) -> bool:
+        if not self.enabled:
+            return False
+        if header is not None:
+            wanted = self.authorized(header)
+        else:
+            wanted = self.sample_rate > 0 and random.random() < self.sample_rate
+        if wanted and self._busy:
+            self.skipped_total += 1
+            return False
+        return wanted
+    
+    def file_name(self, trace_id: str) -> str:
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        return f"{timestamp}-{_UNSAFE_CHARS.sub('_', trace_id)[:64]}{PROFILE_SUFFIX}"
+    
+    async def run(self, name: str, call: Callable[[], Awaitable[None]]) -> None:
+        self._busy = True
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        try:
+            profiler.enable()
+            try:
+                await call()
+            finally:
+                profiler.disable()
+        finally:
+            self._busy = False
+        
+        await asyncio.to_thread(self._save, profiler, name)
+        self.profiled_total += 1
+        logger.info(
+            "Request profiled",
+            profile=name,
+            duration_ms=round((time.perf_counter() - started) * 1000, 3)
+        )
+    
+    def _save(self, profiler: cProfile.Profile, name: str) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(self.directory / name)
+        for stale in self._files()[self.max_files:]:
+            stale.unlink(missing_ok=True)
+    
+    def _files(self) -> list[Path]:
+        if not self.directory.is_dir():
+            return []
+        # Names start with a UTC timestamp, so they sort by age.
+        return sorted(self.directory.glob(f"*{PROFILE_SUFFIX}"), reverse=True)
+    
+    def list_profiles(self) -> list[dict]:
+        profiles = []
+        for path in self._files():
+            stat = path.stat()
+            profiles.append(
+                {
+                    "name": path.name,
+                    "trace_id": path.stem.split("-", 1)[1],
+                    "size": stat.st_size,
+                    "created_at": datetime.fromtimestamp(stat.st_mtime, timezone.utc),
+                }
+            )
+        return profiles
+    
+    def path_for(self, name: str) -> Path | None:
+        if _UNSAFE_CHARS.search(name) or not name.endswith(PROFILE_SUFFIX):
+            return None
+        path = self.directory / name
+        return path if path.is_file() else None
+    
+    def stats(self) -> dict[str, int]:
+        return {
+            "profiled_total": self.profiled_total,
+            "skipped_total": self.skipped_total,
+        }
+
+
+request_profiler = RequestProfiler()
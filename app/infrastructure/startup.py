@@ -0,0 +1,103 @@
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+from app.core import settings
+from app.infrastructure.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
+class StartupTracker:
+    def __init__(self, retry_interval: float = settings.startup_retry_interval):
+        self.retry_interval = retry_interval
+        self.timings_ms: dict[str, float] = {}
+        self.errors: dict[str, str] = {}
+        self._background: set[asyncio.Task] = set()
+    
+    def record(self, name: str, start: float) -> None:
+        self.timings_ms[name] = _elapsed_ms(start)
+    
+    async def _connect_once(
+        self,
+        connect: Callable[[], Awaitable[None]],
+        cleanup: Callable[[], Awaitable[None]] | None,
+        timeout: float,
+    ) -> None:
+        try:
+            await asyncio.wait_for(connect(), timeout=timeout)
+        except BaseException:
+            # A connect cut short by the deadline may have left a half-open
+            # connection behind.
+            if cleanup is not None:
+                try:
+                    await cleanup()
+                except Exception:
+                    pass
+            raise
+    
+    async def connect(
+        self,
+        name: str,
+        connect: Callable[[], Awaitable[None]],
+        timeout: float,
+        cleanup: Callable[[], Awaitable[None]] | None = None,
+        retry_in_background: bool = False,
+    ) -> bool:
+        start = time.perf_counter()
+        try:
+            await self._connect_once(connect, cleanup, timeout)
+        except Exception as e:
+            self.errors[name] = str(e) or type(e).__name__
+            logger.error(
+                "Failed to start dependency",
+                dependency=name,
+                timeout=timeout,
+                error=self.errors[name],
+                retrying=retry_in_background
+            )
+            if retry_in_background:
+                task = asyncio.create_task(self._retry(name, connect, cleanup, timeout, start))
+                self._background.add(task)
+                task.add_done_callback(self._background.discard)
+            return False
+        
+        self.record(name, start)
+        return True
+    
+    async def _retry(
+        self,
+        name: str,
+        connect: Callable[[], Awaitable[None]],
+        cleanup: Callable[[], Awaitable[None]] | None,
+        timeout: float,
+        start: float,
+    ) -> None:
+        while True:
+            await asyncio.sleep(self.retry_interval)
+            try:
+                await self._connect_once(connect, cleanup, timeout)
+            except Exception as e:
+                self.errors[name] = str(e) or type(e).__name__
+                continue
+            
+            self.errors.pop(name, None)
+            self.record(name, start)
+            logger.info(
+                "Dependency connected in background",
+                dependency=name,
+                elapsed_ms=self.timings_ms[name]
+            )
+            return
+    
+    async def stop(self) -> None:
+        for task in self._background:
+            task.cancel()
+        await asyncio.gather(*self._background, return_exceptions=True)
+
+
+startup_tracker = StartupTracker()
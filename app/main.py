@@ -1,38 +1,121 @@
+import time
+
+# Taken before the application imports so the boot log can report how long
+# loading the app took.
+_import_started = time.perf_counter()
+
+import asyncio
 from contextlib import asynccontextmanager
 
 from advanced_alchemy.extensions.litestar import AlembicCommands, SQLAlchemyPlugin
 from litestar import Litestar
 from litestar.openapi import OpenAPIConfig
 
-from app.api.middleware import trace_id_middleware
+from app.api.admission import admission_stats
+from app.api.middleware import (
+    admission_middleware,
+    profiling_middleware,
+    read_your_writes_middleware,
+    trace_id_middleware,
+)
+from app.api.routes.health import HealthController
+from app.api.routes.metrics import MetricsController
+from app.api.routes.profiles import ProfileController
 from app.api.routes.users import UserController
-from app.infrastructure.database import sqlalchemy_config
-from app.infrastructure.logging import configure_logging, get_logger
-from app.infrastructure.messaging import event_consumer, event_producer
+from app.core import settings
+from app.domain.services import user_loader
+from app.infrastructure.cache import user_cache
+from app.infrastructure.database import (
+    engine,
+    ping,
+    pool_stats,
+    prewarm_pool,
+    query_counters,
+    replica_router,
+    sqlalchemy_config,
+)
+from app.infrastructure.logging import configure_logging, get_logger, log_writer_stats
+from app.infrastructure.messaging import event_consumer, event_producer, outbox_relay
+from app.infrastructure.metrics import metrics_registry
+from app.infrastructure.profiling import request_profiler
+from app.infrastructure.startup import startup_tracker
 
 configure_logging()
 logger = get_logger(__name__)
 
+metrics_registry.register_collector("db_pool", lambda: pool_stats(engine))
+metrics_registry.register_collector("log_writer", log_writer_stats)
+metrics_registry.register_collector("admission", admission_stats)
+metrics_registry.register_collector("db", query_counters)
+metrics_registry.register_collector("db_replicas", replica_router.stats)
+metrics_registry.register_collector("profiler", request_profiler.stats)
+metrics_registry.register_collector("user_cache", user_cache.stats)
+metrics_registry.register_collector("user_loader", user_loader.stats)
+metrics_registry.register_collector("outbox_relay", outbox_relay.stats)
+metrics_registry.register_collector("event_producer", event_producer.stats)
+
+
+async def connect_database():
+    prewarm = min(settings.db_pool_prewarm, settings.db_pool_size)
+    if prewarm > 0:
+        await prewarm_pool(engine, prewarm)
+    else:
+        await ping(engine)
+
+
+async def connect_consumer():
+    await event_consumer.connect()
+    await event_consumer.start_consuming()
+
 
 @asynccontextmanager
 async def lifespan(app: Litestar):
     logger.info("Application starting")
+    start = time.perf_counter()
     
-    try:
-        await event_producer.connect()
-    except Exception as e:
-        logger.error("Failed to connect event producer", error=str(e))
+    # Dependencies connect concurrently, each within its own deadline. A broker
+    # that is still coming up does not hold back HTTP: it keeps being retried
+    # in the background while the outbox holds the events.
+    await asyncio.gather(
+        startup_tracker.connect(
+            "database",
+            connect_database,
+            timeout=settings.startup_db_timeout,
+        ),
+        startup_tracker.connect(
+            "event_producer",
+            event_producer.connect,
+            timeout=settings.startup_broker_timeout,
+            cleanup=event_producer.disconnect,
+            retry_in_background=settings.startup_broker_background,
+        ),
+        startup_tracker.connect(
+            "event_consumer",
+            connect_consumer,
+            timeout=settings.startup_broker_timeout,
+            cleanup=event_consumer.disconnect,
+            retry_in_background=settings.startup_broker_background,
+        ),
+    )
     
-    try:
-        await event_consumer.connect()
-        await event_consumer.start_consuming()
-    except Exception as e:
-        logger.error("Failed to connect event consumer", error=str(e))
+    await replica_router.start()
+    await outbox_relay.start()
+    
+    startup_tracker.record("lifespan", start)
+    logger.info(
+        "Application started",
+        **{f"{name}_ms": value for name, value in startup_tracker.timings_ms.items()},
+        failed=sorted(startup_tracker.errors)
+    )
     
     yield
     
     logger.info("Application shutting down")
     
+    await startup_tracker.stop()
+    await outbox_relay.stop()
+    await replica_router.stop()
+    
     try:
         await event_producer.disconnect()
     except Exception as e:
@@ -45,8 +128,16 @@ async def lifespan(app: Litestar):
 
 
 app = Litestar(
-    route_handlers=[UserController],
-    middleware=[trace_id_middleware],
+    route_handlers=[UserController, HealthController, MetricsController, ProfileController],
+    # The trace middleware stays outermost so shed requests are still logged
+    # and counted; the profiler sits right inside it so a profile is keyed by
+    # the trace id and covers the rest of the stack.
+    middleware=[
+        trace_id_middleware,
+        profiling_middleware,
+        admission_middleware,
+        read_your_writes_middleware,
+    ],
     plugins=[SQLAlchemyPlugin(config=sqlalchemy_config)],
     openapi_config=OpenAPIConfig(
         title="User Management API",
@@ -54,5 +145,7 @@ app = Litestar(
         description="REST API for user management with LiteStar",
     ),
     lifespan=[lifespan],
-    debug=True,
+    debug=settings.debug,
 )
+
+startup_tracker.record("import", _import_started)
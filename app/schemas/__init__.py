@@ -1,3 +1,15 @@
-from .user import UserCreate, UserResponse, UserUpdate
+from .pagination import ChangeCursor, UserCursor, decode_change_cursor, decode_cursor, encode_cursor
+from .user import UserChange, UserCreate, UserPatch, UserResponse, UserUpdate
 
-__all__ = ["UserCreate", "UserUpdate", "UserResponse"]
+__all__ = [
+    "UserCreate",
+    "UserUpdate",
+    "UserPatch",
+    "UserResponse",
+    "UserChange",
+    "UserCursor",
+    "ChangeCursor",
+    "encode_cursor",
+    "decode_cursor",
+    "decode_change_cursor",
+]
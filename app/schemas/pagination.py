@@ -0,0 +1,41 @@
+import base64
+import binascii
+from datetime import datetime
+
+import msgspec
+from msgspec import Struct
+
+
+class UserCursor(Struct, array_like=True):
+    created_at: datetime
+    id: int
+
+
+class ChangeCursor(Struct, array_like=True):
+    changed_at: datetime
+    id: int
+
+
+_cursor_encoder = msgspec.msgpack.Encoder()
+_cursor_decoder = msgspec.msgpack.Decoder(UserCursor)
+_change_cursor_decoder = msgspec.msgpack.Decoder(ChangeCursor)
+
+
+def encode_cursor(cursor: UserCursor | ChangeCursor) -> str:
+    return base64.urlsafe_b64encode(_cursor_encoder.encode(cursor)).rstrip(b"=").decode()
+
+
+def _decode(value: str, decoder: msgspec.msgpack.Decoder):
+    padded = value + "=" * (-len(value) % 4)
+    try:
+        return decoder.decode(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError, msgspec.DecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def decode_cursor(value: str) -> UserCursor:
+    return _decode(value, _cursor_decoder)
+
+
+def decode_change_cursor(value: str) -> ChangeCursor:
+    return _decode(value, _change_cursor_decoder)
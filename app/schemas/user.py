@@ -16,9 +16,23 @@ class UserUpdate(Struct):
     password: Optional[str] = None
 
 
+class UserPatch(Struct):
+    id: int
+    name: Optional[str] = None
+    surname: Optional[str] = None
+    password: Optional[str] = None
+
+
 class UserResponse(Struct):
     id: int
     name: str
     surname: str
     created_at: datetime
     updated_at: datetime
+
+
+class UserChange(Struct):
+    id: int
+    changed_at: datetime
+    deleted: bool = False
+    user: Optional[UserResponse] = None
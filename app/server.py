@@ -0,0 +1,81 @@
+import importlib.util
+import os
+
+from granian import Granian
+from granian.constants import Interfaces, Loops
+from granian.http import HTTP1Settings
+
+from app.core import settings
+from app.infrastructure.logging import configure_logging, get_logger
+
+logger = get_logger(__name__)
+
+
+def available_cpus() -> int:
+    # Honour CPU affinity (taskset, container cpusets) where the OS exposes it.
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def worker_count() -> int:
+    if settings.server_workers > 0:
+        return settings.server_workers
+    return available_cpus()
+
+
+def event_loop() -> Loops:
+    if settings.server_loop == "asyncio":
+        return Loops.asyncio
+    if importlib.util.find_spec("uvloop") is not None:
+        return Loops.uvloop
+    if settings.server_loop == "uvloop":
+        logger.warning("uvloop is not installed, falling back to asyncio")
+    return Loops.asyncio
+
+
+def build_server() -> Granian:
+    # The app is imported by every worker process, not here: each worker gets
+    # its own engine and pool, broker connections and caches, all set up by
+    # the lifespan in app.main.
+    return Granian(
+        "app.main:app",
+        address=settings.server_host,
+        port=settings.server_port,
+        interface=Interfaces.ASGI,
+        workers=worker_count(),
+        runtime_threads=settings.server_runtime_threads,
+        loop=event_loop(),
+        backlog=settings.server_backlog,
+        backpressure=settings.server_backpressure or None,
+        http1_settings=HTTP1Settings(
+            keep_alive=settings.server_keep_alive,
+            header_read_timeout=settings.server_header_read_timeout,
+        ),
+        log_access=False,
+        respawn_failed_workers=True,
+    )
+
+
+def main():
+    configure_logging()
+
+    server = build_server()
+    workers = server.workers
+    logger.info(
+        "Starting production server",
+        host=settings.server_host,
+        port=settings.server_port,
+        workers=workers,
+        runtime_threads=settings.server_runtime_threads,
+        loop=server.loop.value,
+        backlog=settings.server_backlog,
+        debug=settings.debug,
+        # Every worker owns a pool, so this is the ceiling PostgreSQL must allow.
+        max_db_connections=workers * (settings.db_pool_size + settings.db_max_overflow),
+    )
+    server.serve()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""UserEvent wire formats: JSON vs the msgpack array layout.
+
+Usage:
+    python -m benchmarks.codec --events 100000
+
+Encodes and decodes the same events with each format through the
+long-lived EventEncoder/EventDecoder pair and reports the mean message
+size and events per second for both directions.
+"""
+import argparse
+import time
+from datetime import datetime, timezone
+
+from app.infrastructure.messaging import EventDecoder, EventEncoder, EventType, UserData, UserEvent
+
+
+def make_events(count: int) -> list[UserEvent]:
+    now = datetime.now(timezone.utc)
+    return [
+        UserEvent(
+            event_type=EventType.USER_UPDATED,
+            user_id=user_id,
+            trace_id="0b6f3c3e-6a61-4b0e-9d55-4c7a2b1f8e10",
+            timestamp=now,
+            data=UserData(name=f"name-{user_id}", surname="surname"),
+        )
+        for user_id in range(count)
+    ]
+
+
+def measure(format: str, events: list[UserEvent]) -> dict[str, float]:
+    encoder = EventEncoder(format)
+    decoder = EventDecoder()
+
+    start = time.perf_counter()
+    bodies = [encoder.encode(event) for event in events]
+    encode_rate = len(events) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    decoded = [decoder.decode(body, encoder.content_type) for body in bodies]
+    decode_rate = len(events) / (time.perf_counter() - start)
+
+    assert decoded[-1].user_id == events[-1].user_id
+    return {
+        "bytes": sum(map(len, bodies)) / len(bodies),
+        "encode_per_second": encode_rate,
+        "decode_per_second": decode_rate,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=100_000)
+    args = parser.parse_args()
+
+    events = make_events(args.events)
+    for format in ("json", "msgpack"):
+        result = measure(format, events)
+        print(
+            f"{format:>8} {result['bytes']:>7.1f} B/event"
+            f" {result['encode_per_second']:>12.0f} enc/s {result['decode_per_second']:>12.0f} dec/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
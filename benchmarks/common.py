@@ -0,0 +1,8 @@
+import logging
+
+import structlog
+
+
+def silence_logging(level: int = logging.WARNING) -> None:
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(level))
+    logging.disable(level - 1)
@@ -0,0 +1,72 @@
+"""In-process stand-ins for the aio-pika objects used by the messaging layer."""
+import asyncio
+import contextlib
+
+
+class FakeExchange:
+    def __init__(self, name: str, confirm_latency: float):
+        self.name = name
+        self.confirm_latency = confirm_latency
+        self.published = 0
+
+    async def publish(self, message, routing_key: str):
+        # Simulates the round trip until the broker confirms the message.
+        await asyncio.sleep(self.confirm_latency)
+        self.published += 1
+
+
+class FakeChannel:
+    def __init__(self, confirm_latency: float):
+        self.confirm_latency = confirm_latency
+        self.is_closed = False
+        self.exchanges: list[FakeExchange] = []
+
+    async def declare_exchange(self, name: str, durable: bool = False) -> FakeExchange:
+        exchange = FakeExchange(name, self.confirm_latency)
+        self.exchanges.append(exchange)
+        return exchange
+
+    async def close(self):
+        self.is_closed = True
+
+
+class FakeConnection:
+    def __init__(self, confirm_latency: float = 0.0005):
+        self.confirm_latency = confirm_latency
+        self.channels: list[FakeChannel] = []
+
+    async def channel(self, publisher_confirms: bool = True) -> FakeChannel:
+        channel = FakeChannel(self.confirm_latency)
+        self.channels.append(channel)
+        return channel
+
+    async def close(self):
+        pass
+
+    @property
+    def published(self) -> int:
+        return sum(
+            exchange.published
+            for channel in self.channels
+            for exchange in channel.exchanges
+        )
+
+
+def fake_connection_factory(confirm_latency: float = 0.0005):
+    async def connect(url: str) -> FakeConnection:
+        return FakeConnection(confirm_latency)
+
+    return connect
+
+
+class FakeIncomingMessage:
+    def __init__(self, body: bytes, content_type: str, headers: dict):
+        self.body = body
+        self.content_type = content_type
+        self.headers = headers
+        self.acked = False
+
+    @contextlib.asynccontextmanager
+    async def process(self):
+        yield
+        self.acked = True
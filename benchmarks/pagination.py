@@ -0,0 +1,92 @@
+"""Offset vs keyset pagination latency at increasing page depth.
+
+Usage:
+    python -m benchmarks.pagination --rows 3000000 --depths 0 1000 10000 100000
+
+Runs against ``DATABASE_URL`` (PostgreSQL expected). With ``--seed`` the users
+table is filled up to ``--rows`` rows first.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core import settings
+from app.domain.models import User
+from app.domain.repositories import AsyncUserRepository
+
+
+async def seed(session: AsyncSession, rows: int) -> None:
+    existing = await session.scalar(select(func.count()).select_from(User))
+    missing = rows - existing
+    if missing <= 0:
+        return
+    await session.execute(
+        text(
+            "INSERT INTO users (name, surname, password, created_at, updated_at) "
+            "SELECT 'name_' || g, 'surname_' || g, 'password', "
+            "now() - (g || ' milliseconds')::interval, now() "
+            "FROM generate_series(1, :missing) AS g"
+        ),
+        {"missing": missing},
+    )
+    await session.commit()
+    await session.execute(text("ANALYZE users"))
+
+
+async def measure(coro_factory, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await coro_factory()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=3_000_000)
+    parser.add_argument("--seed", action="store_true")
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--depths", type=int, nargs="+", default=[0, 1_000, 10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    engine = create_async_engine(settings.database_url)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with session_factory() as session:
+        if args.seed:
+            await seed(session, args.rows)
+        repository = AsyncUserRepository(session)
+
+        print(f"{'depth':>10} {'offset, ms':>12} {'keyset, ms':>12}")
+        for depth in args.depths:
+            anchor = await session.execute(
+                select(User.created_at, User.id)
+                .order_by(User.created_at, User.id)
+                .offset(max(depth - 1, 0))
+                .limit(1)
+            )
+            row = anchor.one_or_none()
+            if row is None:
+                break
+            after = tuple(row) if depth else None
+
+            offset_ms = await measure(
+                lambda: repository.get_all(limit=args.limit, offset=depth), args.repeat
+            )
+            keyset_ms = await measure(
+                lambda: repository.get_all(limit=args.limit, after=after), args.repeat
+            )
+            session.expunge_all()
+            print(f"{depth:>10} {offset_ms:>12.2f} {keyset_ms:>12.2f}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,53 @@
+"""EventProducer throughput: one-at-a-time publishing vs the buffered mode.
+
+Usage:
+    python -m benchmarks.producer --events 20000 --confirm-latency 0.0005
+
+Uses the in-process stand-in transport from ``benchmarks.fakes``; the
+confirm latency models the broker round trip of a confirmed publish.
+"""
+import argparse
+import asyncio
+import time
+
+from app.infrastructure.messaging import EventType, UserData
+from app.infrastructure.messaging.producer import EventProducer
+from benchmarks.common import silence_logging
+from benchmarks.fakes import fake_connection_factory
+
+
+async def run(producer: EventProducer, events: int) -> float:
+    await producer.connect()
+    start = time.perf_counter()
+    for user_id in range(events):
+        await producer.publish_event(EventType.USER_UPDATED, user_id, "benchmark", UserData(name="n", surname="s"))
+    await producer.disconnect(flush_timeout=600)
+    elapsed = time.perf_counter() - start
+    assert producer.connection.published == events
+    return events / elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=20_000)
+    parser.add_argument("--confirm-latency", type=float, default=0.0005)
+    parser.add_argument("--channels", type=int, default=4)
+    parser.add_argument("--max-in-flight", type=int, default=256)
+    args = parser.parse_args()
+    silence_logging()
+
+    factory = fake_connection_factory(args.confirm_latency)
+    direct = EventProducer(mode="direct", connection_factory=factory)
+    buffered = EventProducer(
+        mode="buffered",
+        channel_pool_size=args.channels,
+        max_in_flight=args.max_in_flight,
+        connection_factory=factory,
+    )
+
+    print(f"direct:   {await run(direct, args.events):>10.0f} events/s")
+    print(f"buffered: {await run(buffered, args.events):>10.0f} events/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,93 @@
+"""ORM vs asyncpg fast path for the read endpoints.
+
+Usage:
+    python -m benchmarks.read_path --requests 2000 --concurrency 16
+
+Drives GET /users/{id} and GET /users?limit=100 through the in-process ASGI
+client against ``DATABASE_URL`` (PostgreSQL with asyncpg, seeded with at
+least ``--rows`` users) once per read path, with the user cache disabled.
+Reports requests per second and the median peak traced allocation of a
+single request, measured in a separate sequential pass of ``--alloc-samples``
+requests so tracemalloc does not skew the throughput.
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import tracemalloc
+
+from benchmarks.common import silence_logging
+
+
+async def drive(client, paths: list[str], concurrency: int) -> float:
+    queue = list(paths)
+
+    async def worker():
+        while queue:
+            response = await client.get(queue.pop())
+            assert response.status_code == 200, response.text
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return len(paths) / (time.perf_counter() - start)
+
+
+async def allocations(client, paths: list[str]) -> float:
+    peaks = []
+    tracemalloc.start()
+    for path in paths:
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        response = await client.get(path)
+        peaks.append(tracemalloc.get_traced_memory()[1] - current)
+        assert response.status_code == 200, response.text
+    tracemalloc.stop()
+    return statistics.median(peaks)
+
+
+async def measure(fast_path: bool, args) -> dict[str, float]:
+    from litestar.testing import AsyncTestClient
+
+    from app.core import settings
+    from app.infrastructure.cache import user_cache
+    from app.main import app
+
+    silence_logging()
+    settings.read_fast_path = fast_path
+    user_cache.max_size = 0
+
+    results = {}
+    async with AsyncTestClient(app=app) as client:
+        routes = {
+            "get_user": [f"/users/{random.randint(1, args.rows)}" for _ in range(args.requests)],
+            "list_users": ["/users/?limit=100"] * (args.requests // 10),
+        }
+        for name, paths in routes.items():
+            await drive(client, paths[:args.concurrency], args.concurrency)
+            results[f"{name}_rps"] = await drive(client, paths, args.concurrency)
+            results[f"{name}_alloc_peak_kib_per_request"] = (
+                await allocations(client, paths[:args.alloc_samples]) / 1024
+            )
+    return results
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--alloc-samples", type=int, default=200)
+    args = parser.parse_args()
+
+    from app.infrastructure.database import engine
+    if engine.dialect.driver != "asyncpg":
+        parser.error("the fast path needs a postgresql+asyncpg DATABASE_URL")
+
+    for label, fast_path in (("orm", False), ("asyncpg", True)):
+        for metric, value in (await measure(fast_path, args)).items():
+            print(f"{label:>8} {metric:<34} {value:>10.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
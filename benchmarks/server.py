@@ -0,0 +1,131 @@
+"""Production server profile vs the dev server under HTTP load.
+
+Usage:
+    python -m benchmarks.server --duration 10 --concurrency 64
+
+Starts the app twice as a real server process against ``DATABASE_URL``:
+once the way the README runs it for development (``litestar run --reload``
+with ``DEBUG=true``) and once through ``python -m app.server``. Each server
+is driven over keep-alive HTTP connections for ``--duration`` seconds per
+path; requests per second and latency percentiles are printed per profile.
+The load generator shares the machine, so run it on a host with spare cores.
+With fewer than two CPUs the production profile runs a single worker as
+well and the comparison is inconclusive; a warning is printed in that case.
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+PROFILES = {
+    "dev": (
+        [sys.executable, "-m", "litestar", "--app", "app.main:app", "run", "--reload"],
+        {"DEBUG": "true"},
+    ),
+    "production": (
+        [sys.executable, "-m", "app.server"],
+        {"DEBUG": "false"},
+    ),
+}
+
+
+def start_server(profile: str, port: int) -> subprocess.Popen:
+    command, env = PROFILES[profile]
+    if profile == "dev":
+        command = [*command, "--host", "127.0.0.1", "--port", str(port)]
+    return subprocess.Popen(
+        command,
+        env={
+            **os.environ,
+            **env,
+            "SERVER_HOST": "127.0.0.1",
+            "SERVER_PORT": str(port),
+            "LOG_REQUEST_SAMPLE_RATE": "0",
+        },
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            await client.get("/metrics")
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.2)
+    raise RuntimeError("server did not start in time")
+
+
+async def drive(client: httpx.AsyncClient, path: str, duration: float, concurrency: int) -> dict[str, float]:
+    latencies: list[float] = []
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            response = await client.get(path)
+            latencies.append(time.perf_counter() - start)
+            assert response.status_code == 200, response.text
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+    }
+
+
+async def measure(profile: str, args) -> dict[str, dict[str, float]]:
+    process = start_server(profile, args.port)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{args.port}", limits=limits, timeout=30.0
+        ) as client:
+            await wait_ready(client)
+            results = {}
+            for path in args.paths:
+                await drive(client, path, 1.0, args.concurrency)
+                results[path] = await drive(client, path, args.duration, args.concurrency)
+            return results
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--paths", nargs="+", default=["/users/?limit=20", "/users/1"])
+    args = parser.parse_args()
+
+    from app.server import available_cpus
+
+    if available_cpus() < 2:
+        print(
+            "warning: fewer than 2 CPUs, both profiles run one worker; results are inconclusive",
+            file=sys.stderr,
+        )
+
+    for profile in PROFILES:
+        for path, metrics in (await measure(profile, args)).items():
+            print(
+                f"{profile:>10} {path:<20} {metrics['rps']:>10.1f} rps"
+                f" {metrics['p50_ms']:>8.2f} ms p50 {metrics['p99_ms']:>8.2f} ms p99"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
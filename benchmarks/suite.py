@@ -0,0 +1,414 @@
+"""Hot-path benchmark suite with machine-readable results.
+
+Usage:
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --only codec middleware --baseline results.json
+
+Runs four groups of scenarios against local stand-ins and writes one JSON
+document with throughput, p50/p95/p99 latency and the median peak traced
+allocation per operation for every scenario:
+
+- ``asgi``: UserController endpoints through the in-process ASGI client at
+  ``--concurrency``. Without ``DATABASE_URL`` a throwaway SQLite database is
+  created and seeded with ``--rows`` users; a PostgreSQL ``DATABASE_URL``
+  must already be migrated. The broker is replaced by ``benchmarks.fakes``.
+- ``codec``: msgspec encoding/decoding of UserResponse and UserEvent.
+- ``middleware``: TraceIDMiddleware around a trivial ASGI app vs the bare app.
+- ``messaging``: EventProducer.publish_event (direct and buffered) and
+  EventConsumer._process_message over the fake transport.
+
+Latencies of the fast scenarios are timed in batches of ``--batch``
+operations, so their percentiles are per-operation means of a batch.
+Allocations are measured in a separate sequential pass under tracemalloc,
+which would otherwise skew the timings. With ``--baseline`` the results are
+compared with an earlier run and the exit code is 1 when a scenario lost more
+than ``--tolerance`` of its throughput or p99.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from benchmarks.common import silence_logging
+from benchmarks.fakes import FakeIncomingMessage, fake_connection_factory
+
+TRACE_ID = "0b6f3c3e-6a61-4b0e-9d55-4c7a2b1f8e10"
+
+
+def summarize(latencies: list[float], elapsed: float, ops: int) -> dict[str, float]:
+    latencies = sorted(latencies)
+
+    def percentile(q: float) -> float:
+        return latencies[min(int(len(latencies) * q), len(latencies) - 1)] * 1_000_000
+
+    return {
+        "ops": ops,
+        "throughput": ops / elapsed,
+        "p50_us": percentile(0.50),
+        "p95_us": percentile(0.95),
+        "p99_us": percentile(0.99),
+    }
+
+
+def run_sync(op, ops: int, batch: int) -> dict[str, float]:
+    for _ in range(min(ops // 10, 1000)):
+        op()
+
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(max(ops // batch, 1)):
+        batch_start = time.perf_counter()
+        for _ in range(batch):
+            op()
+        latencies.append((time.perf_counter() - batch_start) / batch)
+    elapsed = time.perf_counter() - start
+    return summarize(latencies, elapsed, len(latencies) * batch)
+
+
+def sync_allocations(op, samples: int) -> dict[str, float]:
+    peaks = []
+    tracemalloc.start()
+    for _ in range(samples):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        op()
+        peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    tracemalloc.stop()
+    return {"alloc_peak_bytes_per_op": statistics.median(peaks)}
+
+
+async def run_async(op, ops: int, concurrency: int) -> dict[str, float]:
+    for i in range(min(ops // 10, 100)):
+        await op(i)
+
+    latencies = []
+    indexes = iter(range(ops))
+
+    async def worker():
+        for i in indexes:
+            op_start = time.perf_counter()
+            await op(i)
+            latencies.append(time.perf_counter() - op_start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - start, ops)
+
+
+async def async_allocations(op, samples: int) -> dict[str, float]:
+    peaks = []
+    tracemalloc.start()
+    for i in range(samples):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        await op(i)
+        peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    tracemalloc.stop()
+    return {"alloc_peak_bytes_per_op": statistics.median(peaks)}
+
+
+async def measure_async(op, ops: int, concurrency: int, samples: int) -> dict[str, float]:
+    return {
+        **await run_async(op, ops, concurrency),
+        **await async_allocations(op, samples),
+    }
+
+
+def measure_sync(op, args) -> dict[str, float]:
+    return {
+        **run_sync(op, args.ops, args.batch),
+        **sync_allocations(op, args.alloc_samples),
+    }
+
+
+def prepare_database(args) -> str:
+    if os.environ.get("DATABASE_URL"):
+        return os.environ["DATABASE_URL"]
+
+    from sqlalchemy import create_engine
+
+    path = os.path.join(tempfile.mkdtemp(prefix="benchmarks-"), "suite.db")
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{path}"
+
+    from app.domain.models import User
+
+    engine = create_engine(f"sqlite:///{path}")
+    User.metadata.create_all(engine)
+    engine.dispose()
+    return os.environ["DATABASE_URL"]
+
+
+async def asgi_scenarios(args) -> dict[str, dict]:
+    from litestar.testing import AsyncTestClient
+
+    from app.core import settings
+    from app.infrastructure.messaging import event_consumer, event_producer
+    from app.main import app
+
+    async def no_broker():
+        pass
+
+    # Outbox events go to the in-process stand-in, the consumer stays idle.
+    event_producer.connection_factory = fake_connection_factory(0.0)
+    event_consumer.connect = no_broker
+    event_consumer.start_consuming = no_broker
+
+    def check(response, status_code: int = 200):
+        assert response.status_code == status_code, response.text
+        return response
+
+    results = {}
+    async with AsyncTestClient(app=app) as client:
+        user_ids = []
+        for offset in range(0, args.rows, settings.batch_max_size):
+            batch = [
+                {"name": f"name-{i}", "surname": "surname", "password": "secret123"}
+                for i in range(offset, min(offset + settings.batch_max_size, args.rows))
+            ]
+            response = check(await client.post("/users/batch", json=batch), 201)
+            user_ids.extend(user["id"] for user in response.json())
+
+        random.seed(0)
+        picks = [random.choice(user_ids) for _ in range(args.requests)]
+
+        async def get_user(i: int):
+            check(await client.get(f"/users/{picks[i % len(picks)]}"))
+
+        async def list_users(i: int):
+            check(await client.get("/users/?limit=20"))
+
+        async def create_user(i: int):
+            check(
+                await client.post("/users/", json={"name": "bench", "surname": "bench", "password": "secret123"}),
+                201,
+            )
+
+        async def update_user(i: int):
+            check(await client.put(f"/users/{picks[i % len(picks)]}", json={"name": f"bench-{i}"}))
+
+        for name, op in (
+            ("get_user", get_user),
+            ("list_users", list_users),
+            ("create_user", create_user),
+            ("update_user", update_user),
+        ):
+            results[f"asgi.{name}"] = await measure_async(
+                op, args.requests, args.concurrency, min(args.alloc_samples, 50)
+            )
+    return results
+
+
+async def codec_scenarios(args) -> dict[str, dict]:
+    import msgspec
+
+    from app.infrastructure.messaging import EventDecoder, EventEncoder, EventType, UserData, UserEvent
+    from app.schemas import UserResponse
+
+    now = datetime.now(timezone.utc)
+    user = UserResponse(id=1, name="name", surname="surname", created_at=now, updated_at=now)
+    event = UserEvent(
+        event_type=EventType.USER_UPDATED,
+        user_id=1,
+        trace_id=TRACE_ID,
+        timestamp=now,
+        data=UserData(name="name", surname="surname"),
+    )
+
+    json_encoder = msgspec.json.Encoder()
+    user_decoder = msgspec.json.Decoder(UserResponse)
+    user_body = json_encoder.encode(user)
+    event_decoder = EventDecoder()
+
+    ops = {
+        "codec.user_response_encode": lambda: json_encoder.encode(user),
+        "codec.user_response_decode": lambda: user_decoder.decode(user_body),
+    }
+    for format in ("json", "msgpack"):
+        encoder = EventEncoder(format)
+        body = encoder.encode(event)
+        ops[f"codec.user_event_encode_{format}"] = lambda encoder=encoder: encoder.encode(event)
+        ops[f"codec.user_event_decode_{format}"] = (
+            lambda body=body, content_type=encoder.content_type: event_decoder.decode(body, content_type)
+        )
+
+    return {name: measure_sync(op, args) for name, op in ops.items()}
+
+
+async def middleware_scenarios(args) -> dict[str, dict]:
+    from app.api.middleware import TraceIDMiddleware
+
+    start_message = {"type": "http.response.start", "status": 200, "headers": []}
+    body_message = {"type": "http.response.body", "body": b"{}"}
+
+    async def app(scope, receive, send):
+        await send(dict(start_message, headers=[]))
+        await send(body_message)
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    def scope():
+        return {
+            "type": "http",
+            "method": "GET",
+            "path": "/users/1",
+            "headers": [(b"host", b"bench"), (b"x-request-id", TRACE_ID.encode())],
+        }
+
+    results = {}
+    for name, wrapped in (("bare", app), ("trace_id", TraceIDMiddleware(app))):
+        async def op(i: int, wrapped=wrapped):
+            await wrapped(scope(), receive, send)
+
+        results[f"middleware.{name}"] = await measure_async(op, args.ops, 1, args.alloc_samples)
+
+    results["middleware.trace_id"]["overhead_p50_us"] = (
+        results["middleware.trace_id"]["p50_us"] - results["middleware.bare"]["p50_us"]
+    )
+    return results
+
+
+async def messaging_scenarios(args) -> dict[str, dict]:
+    from app.infrastructure.messaging import EventEncoder, EventType, UserData, UserEvent
+    from app.infrastructure.messaging.consumer import EventConsumer
+    from app.infrastructure.messaging.producer import EventProducer
+
+    data = UserData(name="name", surname="surname")
+    results = {}
+    for mode in ("direct", "buffered"):
+        producer = EventProducer(mode=mode, connection_factory=fake_connection_factory(0.0))
+        await producer.connect()
+
+        async def publish(i: int, producer=producer):
+            await producer.publish_event(EventType.USER_UPDATED, i, TRACE_ID, data)
+
+        results[f"messaging.publish_{mode}"] = await measure_async(
+            publish, args.ops, 1, args.alloc_samples
+        )
+        await producer.disconnect(flush_timeout=600)
+
+    encoder = EventEncoder()
+    body = encoder.encode(
+        UserEvent(
+            event_type=EventType.USER_UPDATED,
+            user_id=1,
+            trace_id=TRACE_ID,
+            timestamp=datetime.now(timezone.utc),
+            data=data,
+        )
+    )
+    consumer = EventConsumer(mode="single")
+
+    async def consume(i: int):
+        await consumer._process_message(FakeIncomingMessage(body, encoder.content_type, {}))
+
+    results["messaging.consume"] = await measure_async(consume, args.ops, 1, args.alloc_samples)
+    return results
+
+
+GROUPS = {
+    "asgi": asgi_scenarios,
+    "codec": codec_scenarios,
+    "middleware": middleware_scenarios,
+    "messaging": messaging_scenarios,
+}
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> bool:
+    regressed = False
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        throughput = current["throughput"] / previous["throughput"] - 1
+        p99 = current["p99_us"] / previous["p99_us"] - 1
+        flag = throughput < -tolerance or p99 > tolerance
+        regressed |= flag
+        print(
+            f"{name:<36} throughput {throughput:>+7.1%} p99 {p99:>+7.1%}{'  REGRESSION' if flag else ''}",
+            file=sys.stderr,
+        )
+    return regressed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--only", nargs="+", choices=sorted(GROUPS), default=list(GROUPS))
+    parser.add_argument("--output", default="-", help="JSON file, - for stdout")
+    parser.add_argument("--ops", type=int, default=20_000, help="operations per in-memory scenario")
+    parser.add_argument("--batch", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=2_000, help="requests per ASGI scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rows", type=int, default=1_000)
+    parser.add_argument("--alloc-samples", type=int, default=500)
+    parser.add_argument("--baseline", help="earlier JSON output to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args()
+
+    database_url = prepare_database(args) if "asgi" in args.only else None
+    # Any app import loads app.main, which configures logging: silence it after.
+    import app.main  # noqa: F401
+    silence_logging(logging.CRITICAL)
+
+    results = {}
+    for group in args.only:
+        results.update(await GROUPS[group](args))
+        for name in sorted(key for key in results if key.startswith(f"{group}.")):
+            metrics = results[name]
+            print(
+                f"{name:<36} {metrics['throughput']:>12.0f} ops/s"
+                f" {metrics['p50_us']:>9.1f} {metrics['p95_us']:>9.1f} {metrics['p99_us']:>9.1f} us p50/p95/p99"
+                f" {metrics['alloc_peak_bytes_per_op']:>9.0f} B",
+                file=sys.stderr,
+            )
+
+    document = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "database": database_url.split("://", 1)[0] if database_url else None,
+            "args": {key: value for key, value in vars(args).items() if key not in ("output", "baseline")},
+        },
+        "results": results,
+    }
+    rendered = json.dumps(document, indent=2)
+    if args.output == "-":
+        print(rendered)
+    else:
+        with open(args.output, "w") as file:
+            file.write(rendered + "\n")
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)["results"]
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,34 @@
+"""Add (updated_at, id) index and user_tombstones for the change feed
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '004'
+down_revision: Union[str, None] = '003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_users_updated_at_id', 'users', ['updated_at', 'id'])
+    op.create_table(
+        'user_tombstones',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('user_id', sa.BigInteger(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_user_tombstones_deleted_at_user_id', 'user_tombstones', ['deleted_at', 'user_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_tombstones_deleted_at_user_id', table_name='user_tombstones')
+    op.drop_table('user_tombstones')
+    op.drop_index('ix_users_updated_at_id', table_name='users')
@@ -0,0 +1,108 @@
+import asyncio
+
+from app.api import admission
+from app.api.admission import AdmissionLimiter
+from app.core import settings
+
+
+def test_release_hands_the_slot_to_the_oldest_waiter():
+    async def go():
+        limiter = AdmissionLimiter(limit=1, queue_size=2, timeout=1.0)
+        assert await limiter.acquire()
+        first = asyncio.create_task(limiter.acquire())
+        second = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        limiter.release()
+        assert await first
+        assert not second.done()
+        assert limiter.active == 1
+
+        limiter.release()
+        assert await second
+        limiter.release()
+        assert limiter.stats()["active"] == 0
+        assert limiter.stats()["admitted_total"] == 3
+
+    asyncio.run(go())
+
+
+def test_full_queue_rejects_immediately():
+    async def go():
+        limiter = AdmissionLimiter(limit=1, queue_size=1, timeout=1.0)
+        assert await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        assert not await limiter.acquire()
+        assert limiter.rejected_total == 1
+
+        limiter.release()
+        assert await waiter
+
+    asyncio.run(go())
+
+
+def test_queue_timeout_gives_up_the_place():
+    async def go():
+        limiter = AdmissionLimiter(limit=1, queue_size=5, timeout=0.01)
+        assert await limiter.acquire()
+
+        assert not await limiter.acquire()
+        assert limiter.stats()["timeouts_total"] == 1
+        assert limiter.stats()["queued"] == 0
+
+        limiter.release()
+        assert limiter.active == 0
+
+    asyncio.run(go())
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    async def go():
+        limiter = AdmissionLimiter(limit=1, queue_size=5, timeout=1.0)
+        assert await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        assert limiter.stats()["queued"] == 0
+
+        limiter.release()
+        assert limiter.active == 0
+
+    asyncio.run(go())
+
+
+def test_admission_is_off_by_default(client, monkeypatch):
+    monkeypatch.setattr(admission.read_limiter, "limit", 0)
+    monkeypatch.setattr(admission.read_limiter, "queue_size", 0)
+
+    assert client.get("/users/").status_code == 200
+
+
+def test_overloaded_reads_are_shed_with_503(client, monkeypatch):
+    monkeypatch.setattr(settings, "admission_enabled", True)
+    monkeypatch.setattr(admission.read_limiter, "limit", 0)
+    monkeypatch.setattr(admission.read_limiter, "queue_size", 0)
+    rejected = admission.read_limiter.rejected_total
+
+    response = client.get("/users/")
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    assert "x-trace-id" in response.headers
+    assert admission.read_limiter.rejected_total == rejected + 1
+    assert client.get("/health/live").status_code == 200
+
+
+def test_writes_use_their_own_limiter(client, monkeypatch):
+    monkeypatch.setattr(settings, "admission_enabled", True)
+    monkeypatch.setattr(admission.write_limiter, "limit", 0)
+    monkeypatch.setattr(admission.write_limiter, "queue_size", 0)
+
+    response = client.post("/users/", json={"name": "n", "surname": "s", "password": "p"})
+
+    assert response.status_code == 503
+    assert client.get("/users/").status_code == 200
@@ -0,0 +1,69 @@
+import time
+
+import pytest
+
+import app.domain.services.user_service as user_service_module
+from app.core import settings
+
+USER = {"name": "A", "surname": "B", "password": "secret123"}
+
+
+@pytest.fixture()
+def feed(client, monkeypatch):
+    monkeypatch.setattr(settings, "changes_settle_delay", 0.0)
+    monkeypatch.setattr(user_service_module, "_next_purge", {})
+    return client
+
+
+def read(client, since=None, limit=100):
+    params = {"limit": limit} if since is None else {"since": since, "limit": limit}
+    response = client.get("/users/changes", params=params)
+    assert response.status_code == 200, response.text
+    return response.json(), response.headers["x-next-cursor"]
+
+
+def test_pages_follow_the_cursor(feed):
+    ids = [feed.post("/users/", json=USER).json()["id"] for _ in range(3)]
+
+    page, cursor = read(feed, limit=2)
+    assert [change["id"] for change in page] == ids[:2]
+    page, cursor = read(feed, since=cursor, limit=2)
+    assert [change["id"] for change in page] == ids[2:]
+
+    feed.delete(f"/users/{ids[0]}")
+    page, cursor = read(feed, since=cursor)
+    assert [(change["id"], change["deleted"]) for change in page] == [(ids[0], True)]
+
+
+def test_idle_cursor_outlives_the_tombstone_ttl(feed, monkeypatch):
+    user_id = feed.post("/users/", json=USER).json()["id"]
+    feed.delete(f"/users/{user_id}")
+    _, cursor = read(feed)
+
+    # Nothing is written for longer than the retention: the consumer has
+    # missed nothing and its cursor stays valid.
+    time.sleep(0.01)
+    monkeypatch.setattr(settings, "changes_tombstone_ttl", 0)
+    page, next_cursor = read(feed, since=cursor)
+    assert page == []
+    assert next_cursor != cursor
+    page, _ = read(feed, since=next_cursor)
+    assert page == []
+
+
+def test_cursor_from_before_a_purge_expires(feed, monkeypatch):
+    first = feed.post("/users/", json=USER).json()["id"]
+    feed.delete(f"/users/{first}")
+    _, stale = read(feed)
+
+    time.sleep(0.01)
+    monkeypatch.setattr(settings, "changes_tombstone_ttl", 0)
+    user_service_module._next_purge.clear()
+    second = feed.post("/users/", json=USER).json()["id"]
+    feed.delete(f"/users/{second}")
+
+    assert feed.get("/users/changes", params={"since": stale}).status_code == 410
+    # A full resync reads from the start and still works.
+    page, cursor = read(feed)
+    assert page == []
+    assert feed.get("/users/changes", params={"since": cursor}).status_code == 200
@@ -0,0 +1,89 @@
+import asyncio
+from datetime import datetime, timezone
+
+import msgspec
+
+from app.infrastructure.messaging import EventType, UserEvent
+from app.infrastructure.messaging.batching import EventBatcher
+
+BODY = msgspec.json.encode(
+    UserEvent(EventType.USER_CREATED, 1, "trace", datetime.now(timezone.utc))
+)
+
+
+class FakeMessage:
+    def __init__(self, delivery_tag: int, log: list, body: bytes = BODY):
+        self.delivery_tag = delivery_tag
+        self.body = body
+        self.content_type = None
+        self.headers = None
+        self.processed = False
+        self.log = log
+
+    async def ack(self, multiple: bool = False):
+        self.processed = True
+        self.log.append(("ack", self.delivery_tag, multiple))
+
+    async def nack(self, requeue: bool = True):
+        self.processed = True
+        self.log.append(("nack", self.delivery_tag))
+
+    async def reject(self, requeue: bool = False):
+        self.processed = True
+        self.log.append(("reject", self.delivery_tag))
+
+
+class ScriptedHandler:
+    def __init__(self, log: list, delays: list[float], failing: set[int] = frozenset()):
+        self.log = log
+        self.delays = delays
+        self.failing = failing
+        self.calls = 0
+
+    async def handle(self, events):
+        call = self.calls
+        self.calls += 1
+        await asyncio.sleep(self.delays[call])
+        self.log.append(("handled", call))
+        if call in self.failing:
+            raise RuntimeError("handler failed")
+
+
+async def run(handler, tags: int, log: list, bodies: dict[int, bytes] | None = None) -> EventBatcher:
+    batcher = EventBatcher(handler, batch_size=2, batch_timeout=0.01, concurrency=4)
+    for tag in range(1, tags + 1):
+        await batcher.on_message(FakeMessage(tag, log, (bodies or {}).get(tag, BODY)))
+    await batcher.close()
+    return batcher
+
+
+def test_slow_batch_is_not_acked_by_a_faster_later_one():
+    log = []
+    batcher = asyncio.run(run(ScriptedHandler(log, delays=[0.05, 0.0, 0.0]), 6, log))
+
+    # Batches 1 and 2 finish first, yet nothing is acked before batch 0.
+    assert log.index(("handled", 0)) < next(i for i, entry in enumerate(log) if entry[0] == "ack")
+    assert [entry for entry in log if entry[0] == "ack"] == [("ack", 6, True)]
+    assert batcher.processed_total == 6
+    assert not batcher._unacked and not batcher._settled
+
+
+def test_failed_batch_is_nacked_and_skipped_by_the_watermark():
+    log = []
+    batcher = asyncio.run(run(ScriptedHandler(log, delays=[0.0, 0.02, 0.0], failing={1}), 6, log))
+
+    assert ("nack", 3) in log and ("nack", 4) in log
+    acks = [entry for entry in log if entry[0] == "ack"]
+    assert acks[-1] == ("ack", 6, True)
+    assert all(tag not in (3, 4) for _, tag, _ in acks)
+    assert batcher.failed_total == 2 and batcher.processed_total == 4
+    assert not batcher._unacked
+
+
+def test_undecodable_message_is_rejected_without_blocking_acks():
+    log = []
+    batcher = asyncio.run(run(ScriptedHandler(log, delays=[0.0, 0.0]), 5, log, {3: b"not json"}))
+
+    assert ("reject", 3) in log
+    assert [entry for entry in log if entry[0] == "ack"][-1] == ("ack", 5, True)
+    assert batcher.processed_total == 4
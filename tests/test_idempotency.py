@@ -0,0 +1,104 @@
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core import settings
+from app.domain.repositories import AsyncIdempotencyRepository
+
+USER = {"name": "A", "surname": "B", "password": "secret123"}
+
+
+@pytest.fixture()
+def count_rows(database_path):
+    def count_rows(table: str) -> int:
+        with sqlite3.connect(database_path) as connection:
+            return connection.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+
+    return count_rows
+
+
+def test_retry_replays_the_stored_response(client, count_rows):
+    first = client.post("/users/", json=USER, headers={"Idempotency-Key": "k1"})
+    second = client.post("/users/", json=USER, headers={"Idempotency-Key": "k1"})
+
+    assert first.status_code == 201
+    assert "idempotent-replayed" not in first.headers
+    assert second.status_code == 201
+    assert second.headers["idempotent-replayed"] == "true"
+    assert second.json() == first.json()
+    assert count_rows("users") == 1
+    assert count_rows("idempotency_keys") == 1
+
+
+def test_key_reused_for_another_request_is_rejected(client):
+    user_id = client.post("/users/", json=USER, headers={"Idempotency-Key": "k1"}).json()["id"]
+
+    assert client.post("/users/", json={**USER, "name": "C"}, headers={"Idempotency-Key": "k1"}).status_code == 422
+    assert client.put(f"/users/{user_id}", json={"name": "Z"}, headers={"Idempotency-Key": "k1"}).status_code == 422
+
+
+def test_update_is_replayed(client):
+    user_id = client.post("/users/", json=USER).json()["id"]
+
+    first = client.put(f"/users/{user_id}", json={"name": "Z"}, headers={"Idempotency-Key": "u1"})
+    second = client.put(f"/users/{user_id}", json={"name": "Z"}, headers={"Idempotency-Key": "u1"})
+
+    assert first.status_code == 200
+    assert second.headers["idempotent-replayed"] == "true"
+    assert second.json() == first.json()
+
+
+def test_not_found_is_not_stored(client, count_rows):
+    response = client.put("/users/999", json={"name": "Z"}, headers={"Idempotency-Key": "u2"})
+
+    assert response.status_code == 404
+    assert count_rows("idempotency_keys") == 0
+
+
+def test_concurrent_duplicates_create_one_user(client, count_rows):
+    def create(_):
+        return client.post("/users/", json=USER, headers={"Idempotency-Key": "concurrent"})
+
+    with ThreadPoolExecutor(5) as pool:
+        responses = list(pool.map(create, range(5)))
+
+    assert [response.status_code for response in responses] == [201] * 5
+    assert len({response.json()["id"] for response in responses}) == 1
+    assert sum("idempotent-replayed" in response.headers for response in responses) == 4
+    assert count_rows("users") == 1
+
+
+def test_expired_key_is_claimed_again(client, count_rows, monkeypatch):
+    client.post("/users/", json=USER, headers={"Idempotency-Key": "expired"})
+    monkeypatch.setattr(settings, "idempotency_ttl", -1)
+
+    response = client.post("/users/", json=USER, headers={"Idempotency-Key": "expired"})
+
+    assert "idempotent-replayed" not in response.headers
+    assert count_rows("users") == 2
+
+
+def test_lost_claim_writes_nothing(client, count_rows, monkeypatch):
+    async def claim(self, *args):
+        return False
+
+    monkeypatch.setattr(AsyncIdempotencyRepository, "claim", claim)
+
+    response = client.post("/users/", json=USER, headers={"Idempotency-Key": "lost"})
+
+    assert response.status_code == 409
+    assert count_rows("users") == 0
+
+
+def test_failed_completion_rolls_the_write_back(client, count_rows, monkeypatch):
+    async def complete(self, *args):
+        return False
+
+    monkeypatch.setattr(AsyncIdempotencyRepository, "complete", complete)
+
+    response = client.post("/users/", json=USER, headers={"Idempotency-Key": "taken"})
+
+    assert response.status_code == 409
+    assert count_rows("users") == 0
+    assert count_rows("idempotency_keys") == 0
@@ -0,0 +1,44 @@
+import pytest
+
+from app.infrastructure.profiling import RequestProfiler, request_profiler
+
+
+@pytest.fixture()
+def profiler(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(request_profiler, "enabled", True)
+    monkeypatch.setattr(request_profiler, "token", "s3cret")
+    monkeypatch.setattr(request_profiler, "directory", tmp_path)
+    return client
+
+
+def test_token_check_accepts_only_the_token():
+    profiler = RequestProfiler(enabled=True, token="s3cret")
+
+    assert profiler.authorized("s3cret")
+    assert not profiler.authorized("wrong")
+    assert not profiler.authorized(None)
+    assert not profiler.authorized("s3crét")
+    assert not profiler.authorized("пароль")
+
+
+def test_non_ascii_token_matches_its_header_bytes():
+    profiler = RequestProfiler(enabled=True, token="пароль")
+
+    # Header values reach the app decoded as latin-1.
+    assert profiler.authorized("пароль".encode().decode("latin-1"))
+
+
+def test_non_ascii_profile_header_is_not_an_error(profiler):
+    response = profiler.get("/users/", headers={"X-Profile": "s3cr\xe9t".encode("latin-1")})
+
+    assert response.status_code == 200
+    assert "x-profile-id" not in response.headers
+    assert profiler.get("/admin/profiles/", headers={"X-Profile": b"\xff"}).status_code == 403
+
+
+def test_profile_is_recorded_for_the_token(profiler):
+    response = profiler.get("/users/", headers={"X-Profile": "s3cret"})
+
+    assert response.status_code == 200
+    listed = profiler.get("/admin/profiles/", headers={"X-Profile": "s3cret"}).json()
+    assert [profile["name"] for profile in listed] == [response.headers["x-profile-id"]]
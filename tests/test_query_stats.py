@@ -0,0 +1,59 @@
+import asyncio
+from datetime import datetime, timezone
+
+from app.core import settings
+from app.domain.repositories import AsyncpgUserRepository
+from app.infrastructure.database import query_counters, start_query_stats
+
+
+class FakeDriver:
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    async def fetch(self, query, *args):
+        self.queries.append(query)
+        await asyncio.sleep(0.002)
+        return self.rows
+
+
+class FakeSession:
+    def __init__(self, driver):
+        self.driver = driver
+
+    async def connection(self):
+        return self
+
+    async def get_raw_connection(self):
+        return self
+
+    @property
+    def driver_connection(self):
+        return self.driver
+
+
+def test_fast_path_queries_count_towards_request_stats(monkeypatch):
+    monkeypatch.setattr(settings, "db_slow_query_threshold", 0.001)
+    now = datetime.now(timezone.utc)
+    repository = AsyncpgUserRepository(FakeSession(FakeDriver([(1, "A", "B", now, now)])))
+    slow_queries = query_counters()["slow_queries_total"]
+
+    async def go():
+        stats = start_query_stats()
+        user = await repository.get_by_id(1)
+        users = await repository.get_all(limit=10)
+        return stats, user, users
+
+    stats, user, users = asyncio.run(go())
+
+    assert user.id == 1
+    assert [user.id for user in users] == [1]
+    assert stats.queries == 2
+    assert stats.db_time >= 0.004
+    assert query_counters()["slow_queries_total"] == slow_queries + 2
+
+
+def test_fast_path_missing_row():
+    repository = AsyncpgUserRepository(FakeSession(FakeDriver([])))
+
+    assert asyncio.run(repository.get_by_id(1)) is None
@@ -0,0 +1,90 @@
+import os
+
+import pytest
+from sqlalchemy import create_engine, insert
+
+from app.core import settings
+from app.domain.models import User
+from app.infrastructure.cache import user_cache
+from app.infrastructure.database import ReplicaRouter, replica_router
+
+
+def use_replicas(monkeypatch, urls: list[str]) -> None:
+    router = ReplicaRouter(urls)
+    monkeypatch.setattr(replica_router, "engines", router.engines)
+    monkeypatch.setattr(replica_router, "_healthy", router._healthy)
+
+
+@pytest.fixture()
+def replica(client, database_path, monkeypatch):
+    # A second SQLite file stands in for the replica. It holds a stale copy of
+    # user 1, so every response shows which database served it.
+    path = os.path.join(os.path.dirname(database_path), "replica.db")
+    if os.path.exists(path):
+        os.remove(path)
+    engine = create_engine(f"sqlite:///{path}")
+    User.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(User), [{"name": "replica", "surname": "s", "password": "p"}])
+    engine.dispose()
+
+    client.post("/users/", json={"name": "primary", "surname": "s", "password": "p"})
+    client.cookies.clear()
+    user_cache.clear()
+
+    use_replicas(monkeypatch, [f"sqlite+aiosqlite:///{path}"])
+    return client
+
+
+def test_reads_go_to_the_replica(replica):
+    assert replica.get("/users/1").json()["name"] == "replica"
+    assert [user["name"] for user in replica.get("/users/").json()] == ["replica"]
+
+
+def test_dead_replica_falls_back_to_the_primary(replica, monkeypatch):
+    use_replicas(monkeypatch, ["sqlite+aiosqlite:////nonexistent/dir/replica.db"])
+    fallbacks = replica_router.primary_fallbacks_total
+
+    assert replica.get("/users/1").json()["name"] == "primary"
+    assert replica_router._healthy == [False]
+    assert replica_router.primary_fallbacks_total > fallbacks
+
+
+def test_write_pins_the_client_to_the_primary(replica):
+    response = replica.put("/users/1", json={"name": "updated"})
+
+    assert "db_primary=1" in response.headers["set-cookie"]
+    assert replica.get("/users/1").json()["name"] == "updated"
+
+    # The primary read filled the cache, so the row stays fresh once the
+    # client is back on the replica.
+    replica.cookies.clear()
+    assert replica.get("/users/1").json()["name"] == "updated"
+
+
+def test_read_consistency_header_selects_the_primary(replica):
+    response = replica.get("/users/1", headers={"X-Read-Consistency": "primary"})
+
+    assert response.json()["name"] == "primary"
+
+
+@pytest.mark.parametrize("loader_enabled", [True, False])
+def test_replica_reads_do_not_fill_the_cache(replica, monkeypatch, loader_enabled):
+    # A lagging replica must not overwrite the cache with a stale row that
+    # later primary reads would then be served from.
+    monkeypatch.setattr(settings, "user_loader_enabled", loader_enabled)
+
+    assert replica.get("/users/1").json()["name"] == "replica"
+    assert replica.get("/users/", params={"ids": "1"}).json()[0]["name"] == "replica"
+    assert user_cache.get(1) is None
+
+    response = replica.get("/users/1", headers={"X-Read-Consistency": "primary"})
+    assert response.json()["name"] == "primary"
+
+
+def test_primary_reads_still_fill_the_cache(client, database_path):
+    client.post("/users/", json={"name": "primary", "surname": "s", "password": "p"})
+    user_cache.clear()
+
+    assert client.get("/users/1").status_code == 200
+    assert user_cache.get(1).name == "primary"
@@ -0,0 +1,129 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from app.domain.services import UserLoader
+from app.schemas import UserResponse
+
+
+def user(user_id: int, name: str | None = None) -> UserResponse:
+    now = datetime.now(timezone.utc)
+    return UserResponse(id=user_id, name=name or f"name-{user_id}", surname="s", created_at=now, updated_at=now)
+
+
+class RecordingLoad:
+    def __init__(self, delay: float = 0.0, error: Exception | None = None):
+        self.delay = delay
+        self.error = error
+        self.batches: list[list[int]] = []
+
+    async def __call__(self, user_ids: list[int]) -> dict[int, UserResponse]:
+        self.batches.append(sorted(user_ids))
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        # Id 0 does not exist.
+        return {user_id: user(user_id) for user_id in user_ids if user_id}
+
+
+def test_lookups_in_one_tick_share_one_batch():
+    load = RecordingLoad()
+    loader = UserLoader(load)
+
+    async def go():
+        return await asyncio.gather(*(loader.load(user_id) for user_id in (1, 2, 1, 3, 0)))
+
+    results = asyncio.run(go())
+
+    assert load.batches == [[0, 1, 2, 3]]
+    assert [result.id if result else None for result in results] == [1, 2, 1, 3, None]
+    assert loader.stats()["coalesced_total"] == 1
+    assert loader.stats()["in_flight"] == 0
+
+
+def test_lookup_joins_a_batch_already_in_flight():
+    load = RecordingLoad(delay=0.02)
+    loader = UserLoader(load)
+
+    async def go():
+        first = asyncio.create_task(loader.load(1))
+        await asyncio.sleep(0.005)
+        second = await loader.load(1)
+        return await first, second
+
+    first, second = asyncio.run(go())
+
+    assert load.batches == [[1]]
+    assert first == second
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_lookup():
+    load = RecordingLoad(delay=0.02)
+    loader = UserLoader(load)
+
+    async def go():
+        cancelled = asyncio.create_task(loader.load(1))
+        waiting = asyncio.create_task(loader.load(1))
+        await asyncio.sleep(0.005)
+        cancelled.cancel()
+        return await waiting
+
+    assert asyncio.run(go()).id == 1
+    assert load.batches == [[1]]
+
+
+def test_batch_error_reaches_every_caller():
+    loader = UserLoader(RecordingLoad(error=RuntimeError("database down")))
+
+    async def go():
+        return await asyncio.gather(loader.load(1), loader.load(2), return_exceptions=True)
+
+    results = asyncio.run(go())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert loader.stats()["in_flight"] == 0
+
+
+def test_next_lookup_after_a_failure_runs_a_new_batch():
+    load = RecordingLoad(error=RuntimeError("database down"))
+    loader = UserLoader(load)
+
+    async def go():
+        with pytest.raises(RuntimeError):
+            await loader.load(1)
+        load.error = None
+        return await loader.load(1)
+
+    assert asyncio.run(go()).id == 1
+    assert load.batches == [[1], [1]]
+
+
+def test_lookup_after_a_write_does_not_join_an_older_batch():
+    rows = {1: "before"}
+    generation = 0
+    batches = []
+
+    async def load(user_ids):
+        batches.append(sorted(user_ids))
+        # The row is read first; a write may commit while the batch is still
+        # finishing.
+        snapshot = {user_id: rows[user_id] for user_id in user_ids}
+        await asyncio.sleep(0.02)
+        return {user_id: user(user_id, name) for user_id, name in snapshot.items()}
+
+    loader = UserLoader(load, generation=lambda: generation)
+
+    async def go():
+        nonlocal generation
+        before = asyncio.create_task(loader.load(1))
+        await asyncio.sleep(0.005)
+        # Commit, then invalidate, as UserService does after a write.
+        rows[1] = "after"
+        generation += 1
+        after = await loader.load(1)
+        return (await before).name, after.name
+
+    assert asyncio.run(go()) == ("before", "after")
+    assert batches == [[1], [1]]
+    assert loader.stats()["in_flight"] == 0